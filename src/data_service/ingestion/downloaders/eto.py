@@ -1,7 +1,8 @@
 """ETo - Iowa Corn Fields Only - Incremental (May-Oct)"""
-import ee, pandas as pd, io, logging, sys, json
+import ee, pandas as pd, logging, sys, json
 from google.cloud import storage
 import google.auth
+from utils.parquet import PARQUET_OPTIONS
 from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
@@ -31,26 +32,31 @@ def main():
     counties = ee.FeatureCollection(counties_geojson)
     logger.info(f"✓ Loaded {counties.size().getInfo()} Iowa counties")
 
+    # Use current date as end (not fixed Oct 31); read the clock once so the
+    # up-to-date check and the download window agree
+    end_date = datetime.now().strftime("%Y-%m-%d")
+
     # Check existing consolidated data
     gcs_path = "data_raw_new/weather/eto/iowa_corn_eto_20160501_20251031.parquet"
     blob = bucket.blob(gcs_path)
 
     if blob.exists():
         logger.info("Found existing data, checking last date...")
-        existing_df = pd.read_parquet(io.BytesIO(blob.download_as_bytes()))
+        existing_df = pd.read_parquet(
+            f"gs://agriguard-ac215-data/{gcs_path}",
+            storage_options={'token': credentials}
+        )
         last_date = pd.to_datetime(existing_df['date']).max()
         start_date = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
         logger.info(f"Last date in existing data: {last_date.strftime('%Y-%m-%d')}")
         
-        if start_date > datetime.now().strftime("%Y-%m-%d"):
+        if start_date > end_date:
             logger.info("✓ ALREADY UP TO DATE!")
             return
     else:
         existing_df = None
         start_date = "2016-05-01"
 
-    # Use current date as end (not fixed Oct 31)
-    end_date = datetime.now().strftime("%Y-%m-%d")
     logger.info(f"Will download from: {start_date} to {end_date}")
 
     # Load corn masks
@@ -78,61 +84,67 @@ def main():
         return
 
     results = []
-    image_list = collection.toList(count)
+    reducer = ee.Reducer.mean().combine(
+        ee.Reducer.stdDev(), sharedInputs=True
+    ).combine(
+        ee.Reducer.minMax(), sharedInputs=True
+    )
 
-    logger.info("Processing images...")
-    for i in range(count):
-        try:
-            image = ee.Image(image_list.get(i))
-            date_str = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd').getInfo()
-            year = int(date_str.split('-')[0])
-            month = int(date_str.split('-')[1])
-            
-            # Only May-October (corn season)
-            if month < 5 or month > 10:
-                continue
-            
-            # Get corn mask
-            mask_year = year
-            while mask_year >= 2010 and mask_year not in corn_masks:
-                mask_year -= 1
-            
-            if mask_year >= 2010 and mask_year in corn_masks:
-                masked_image = image.updateMask(corn_masks[mask_year])
-            else:
-                logger.warning(f"  No mask for {year}, skipping")
-                continue
-            
-            stats = masked_image.select('eto').reduceRegions(
+    # Reduce every image of a month server-side and fetch the county stats with a
+    # single getInfo (~31 images x 99 counties stays under EE's 5000-element limit)
+    logger.info("Processing images in monthly batches...")
+    months = pd.date_range(pd.Timestamp(start_date).replace(day=1), end_date, freq='MS')
+    for month_start in months:
+        # Only May-October (corn season)
+        if month_start.month < 5 or month_start.month > 10:
+            continue
+
+        # Get corn mask
+        year = month_start.year
+        mask_year = year
+        while mask_year >= 2010 and mask_year not in corn_masks:
+            mask_year -= 1
+
+        if mask_year < 2010:
+            logger.warning(f"  No mask for {year}, skipping")
+            continue
+
+        window_start = max(month_start, pd.Timestamp(start_date)).strftime("%Y-%m-%d")
+        window_end = min(month_start + pd.offsets.MonthBegin(1), pd.Timestamp(end_date)).strftime("%Y-%m-%d")
+
+        def reduce_image(image, corn_mask=corn_masks[mask_year]):
+            date = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd')
+            stats = image.updateMask(corn_mask).select('eto').reduceRegions(
                 collection=counties,
-                reducer=ee.Reducer.mean().combine(
-                    ee.Reducer.stdDev(), sharedInputs=True
-                ).combine(
-                    ee.Reducer.minMax(), sharedInputs=True
-                ),
+                reducer=reducer,
                 scale=4000
             )
-            
-            for feature in stats.getInfo()['features']:
-                props = feature['properties']
-                results.append({
-                    'date': date_str,
-                    'fips': props.get('GEOID') or props.get('fips') or props.get('FIPS'),
-                    'county_name': props.get('NAME') or props.get('name') or props.get('county_name'),
-                    'mean': props.get('mean'),
-                    'std': props.get('stdDev'),
-                    'min': props.get('min'),
-                    'max': props.get('max'),
-                    'mask_year': mask_year
-                })
-            
-            if (i+1) % 30 == 0 or (i+1) == count:
-                logger.info(f"  Progress: {i+1}/{count} - {date_str} (mask: {mask_year}) - {len(results)} records")
-        
+            return stats.map(lambda feature: feature.set('date', date))
+
+        try:
+            batch = ee.FeatureCollection(
+                collection.filterDate(window_start, window_end).map(reduce_image)
+            ).flatten()
+            features = batch.getInfo()['features']
         except Exception as e:
-            logger.warning(f"  Error on image {i}: {e}")
+            logger.warning(f"  Error on {month_start.strftime('%Y-%m')}: {e}")
             continue
 
+        for feature in features:
+            props = feature['properties']
+            results.append({
+                'date': props.get('date'),
+                'fips': props.get('GEOID') or props.get('fips') or props.get('FIPS'),
+                'county_name': props.get('NAME') or props.get('name') or props.get('county_name'),
+                'mean': props.get('mean'),
+                'std': props.get('stdDev'),
+                'min': props.get('min'),
+                'max': props.get('max'),
+                'mask_year': mask_year
+            })
+
+        logger.info(f"  Progress: {month_start.strftime('%Y-%m')} (mask: {mask_year}) - {len(results)} records")
+
     logger.info(f"Extracted {len(results)} records from {count} images")
 
     if len(results) == 0:
@@ -150,11 +162,13 @@ def main():
     else:
         final_df = new_df.sort_values(['date','fips']).reset_index(drop=True)
 
-    # Save to GCS
-    buffer = io.BytesIO()
-    final_df.to_parquet(buffer, index=False)
-    buffer.seek(0)
-    blob.upload_from_file(buffer, content_type='application/octet-stream')
+    # Save to GCS (streamed through gcsfs: row groups are uploaded as they are encoded)
+    final_df.to_parquet(
+        f"gs://agriguard-ac215-data/{gcs_path}",
+        index=False,
+        storage_options={'token': credentials},
+        **PARQUET_OPTIONS
+    )
 
     logger.info("=" * 70)
     logger.info(f"✓ ETo COMPLETE!")
@@ -33,12 +33,17 @@ def main():
     missing_years = []
     existing_years = []
 
+    # One listing of the mask prefix instead of an existence check per year
+    mask_sizes = {
+        blob.name: blob.size
+        for blob in storage_client.list_blobs(bucket, prefix="data_raw/masks/corn/")
+    }
+
     for year in range(start_year, end_year + 1):
         mask_path = f"data_raw/masks/corn/iowa_corn_mask_{year}.tif"
-        blob = bucket.blob(mask_path)
         
-        if blob.exists():
-            logger.info(f"  ✓ {year} - exists ({blob.size} bytes)")
+        if mask_path in mask_sizes:
+            logger.info(f"  ✓ {year} - exists ({mask_sizes[mask_path]} bytes)")
             existing_years.append(year)
         else:
             logger.info(f"  ✗ {year} - MISSING")
@@ -50,6 +55,9 @@ def main():
 
     logger.info(f"\nDownloading {len(missing_years)} missing masks: {missing_years}")
 
+    # Get Iowa bounds (rough)
+    iowa = ee.Geometry.BBox(-96.8, 40.2, -90.0, 43.5)
+
     # Download missing CDL masks
     for year in missing_years:
         try:
@@ -61,9 +69,6 @@ def main():
             # Mask for corn only (value = 1)
             corn_mask = cdl.eq(1).toByte()
             
-            # Get Iowa bounds (rough)
-            iowa = ee.Geometry.BBox(-96.8, 40.2, -90.0, 43.5)
-            
             # Export to GCS
             task = ee.batch.Export.image.toCloudStorage(
                 image=corn_mask,
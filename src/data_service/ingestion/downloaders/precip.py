@@ -1,12 +1,35 @@
 """Precipitation + Water Deficit - Iowa Corn Fields - Incremental (May-Oct)"""
-import ee, pandas as pd, io, logging, sys, json
+import ee, pandas as pd, numpy as np, io, logging, sys, json, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 import google.auth
+from utils.parquet import PARQUET_OPTIONS, UPLOAD_CHUNK_SIZE
 from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def features_to_frame(features, mask_year):
+    """Build a typed records frame column-wise from one batch of reduceRegions features"""
+    props = pd.DataFrame([feature['properties'] for feature in features])
+
+    def first_of(*names):
+        # County properties differ between sources: take the first key that is set
+        return props.reindex(columns=list(names)).bfill(axis=1).iloc[:, 0]
+
+    stats = props.reindex(columns=['mean', 'stdDev', 'min', 'max']).astype('float64')
+    return pd.DataFrame({
+        'date': props['date'],
+        'fips': first_of('GEOID', 'fips', 'FIPS'),
+        'county_name': first_of('NAME', 'name', 'county_name'),
+        'mean': stats['mean'],
+        'std': stats['stdDev'],
+        'min': stats['min'],
+        'max': stats['max'],
+        'mask_year': mask_year
+    })
+
 def main():
     """Download and update precipitation and water deficit data incrementally"""
     
@@ -29,28 +52,38 @@ def main():
     counties_blob = bucket.blob("data_raw/masks/iowa_counties.geojson")
     counties_geojson = json.loads(counties_blob.download_as_text())
     counties = ee.FeatureCollection(counties_geojson)
-    logger.info(f"✓ Loaded {counties.size().getInfo()} Iowa counties")
+    logger.info(f"✓ Loaded {len(counties_geojson['features'])} Iowa counties")
+
+    # Use current date as end (not fixed Oct 31); read the clock once so the
+    # up-to-date check and the download window agree
+    end_date = datetime.now().strftime("%Y-%m-%d")
 
     # Check existing consolidated data
     gcs_path = "data_raw_new/weather/pr/iowa_corn_pr_20160501_20251031.parquet"
-    blob = bucket.blob(gcs_path)
+    blob = bucket.get_blob(gcs_path, chunk_size=UPLOAD_CHUNK_SIZE)
+    # Uploads are conditional on the generation this run started from (0 = must not
+    # exist yet): a concurrent run is never silently overwritten, and retries are safe
+    generation = blob.generation if blob is not None else 0
 
-    if blob.exists():
+    if blob is not None:
         logger.info("Found existing data, checking last date...")
-        existing_df = pd.read_parquet(io.BytesIO(blob.download_as_bytes()))
-        last_date = pd.to_datetime(existing_df['date']).max()
+        existing_df = pd.read_parquet(
+            f"gs://agriguard-ac215-data/{gcs_path}",
+            storage_options={'token': credentials}
+        )
+        # ISO YYYY-MM-DD strings order like dates: parse only the max, not the whole column
+        last_date = pd.Timestamp(existing_df['date'].max())
         start_date = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
         logger.info(f"Last date in existing data: {last_date.strftime('%Y-%m-%d')}")
         
-        if start_date > datetime.now().strftime("%Y-%m-%d"):
+        if start_date > end_date:
             logger.info("✓ ALREADY UP TO DATE!")
             return
     else:
+        blob = bucket.blob(gcs_path, chunk_size=UPLOAD_CHUNK_SIZE)
         existing_df = None
         start_date = "2016-05-01"
 
-    # Use current date as end (not fixed Oct 31)
-    end_date = datetime.now().strftime("%Y-%m-%d")
     logger.info(f"Will download from: {start_date} to {end_date}")
 
     # Load corn masks
@@ -64,140 +97,210 @@ def main():
         except:
             pass
 
-    # GridMET Precipitation daily collection
+    # GridMET Precipitation daily collection, May-October only (corn season) so
+    # off-season images never cost a client round-trip
     collection = ee.ImageCollection('IDAHO_EPSCOR/GRIDMET') \
         .filterDate(start_date, end_date) \
+        .filter(ee.Filter.calendarRange(5, 10, 'month')) \
         .filterBounds(counties) \
         .select('pr')
 
-    count = collection.size().getInfo()
+    # One server-side aggregation returns every image timestamp: gives the count and
+    # the months that actually have images, so no batch is planned for an empty month
+    image_dates = pd.to_datetime(collection.aggregate_array('system:time_start').getInfo(), unit='ms')
+    count = len(image_dates)
     logger.info(f"Found {count} daily precipitation images")
 
     if count == 0:
         logger.info("✓ NO NEW DATA")
         return
 
-    results = []
-    image_list = collection.toList(count)
+    frames = []
+    n_records = 0
+    reducer = ee.Reducer.mean().combine(
+        ee.Reducer.stdDev(), sharedInputs=True
+    ).combine(
+        ee.Reducer.minMax(), sharedInputs=True
+    )
 
-    logger.info("Processing images...")
-    for i in range(count):
-        try:
-            image = ee.Image(image_list.get(i))
-            date_str = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd').getInfo()
-            year = int(date_str.split('-')[0])
-            month = int(date_str.split('-')[1])
-            
-            # Only May-October (corn season)
-            if month < 5 or month > 10:
-                continue
-            
-            # Get corn mask
-            mask_year = year
-            while mask_year >= 2010 and mask_year not in corn_masks:
-                mask_year -= 1
-            
-            if mask_year >= 2010 and mask_year in corn_masks:
-                masked_image = image.updateMask(corn_masks[mask_year])
-            else:
-                logger.warning(f"  No mask for {year}, skipping")
-                continue
-            
-            stats = masked_image.select('pr').reduceRegions(
+    def reduce_month(window_start, window_end, corn_mask, retries=3):
+        """Reduce one month of images server-side and fetch all county stats with one getInfo"""
+        def reduce_image(image):
+            date = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd')
+            stats = image.updateMask(corn_mask).select('pr').reduceRegions(
                 collection=counties,
-                reducer=ee.Reducer.mean().combine(
-                    ee.Reducer.stdDev(), sharedInputs=True
-                ).combine(
-                    ee.Reducer.minMax(), sharedInputs=True
-                ),
+                reducer=reducer,
                 scale=4000
             )
-            
-            for feature in stats.getInfo()['features']:
-                props = feature['properties']
-                results.append({
-                    'date': date_str,
-                    'fips': props.get('GEOID') or props.get('fips') or props.get('FIPS'),
-                    'county_name': props.get('NAME') or props.get('name') or props.get('county_name'),
-                    'mean': props.get('mean'),
-                    'std': props.get('stdDev'),
-                    'min': props.get('min'),
-                    'max': props.get('max'),
-                    'mask_year': mask_year
-                })
-            
-            if (i+1) % 30 == 0 or (i+1) == count:
-                logger.info(f"  Progress: {i+1}/{count} - {date_str} (mask: {mask_year}) - {len(results)} records")
-        
-        except Exception as e:
-            logger.warning(f"  Error on image {i}: {e}")
+            return stats.map(lambda feature: feature.set('date', date))
+
+        batch = ee.FeatureCollection(
+            collection.filterDate(window_start, window_end).map(reduce_image)
+        ).flatten()
+        for attempt in range(retries):
+            try:
+                return batch.getInfo()['features']
+            except Exception as e:
+                if attempt == retries - 1:
+                    raise
+                wait = 2 ** attempt
+                logger.warning(f"  Retrying {window_start} in {wait}s: {e}")
+                time.sleep(wait)
+
+    # Plan one batch per in-season month (~31 images x 99 counties stays under EE's
+    # 5000-element getInfo limit)
+    batches = []
+    months = image_dates.to_period('M').unique().sort_values().to_timestamp()
+    for month_start in months:
+        # Only May-October (corn season)
+        if month_start.month < 5 or month_start.month > 10:
             continue
 
-    logger.info(f"Extracted {len(results)} records from {count} images")
+        # Get corn mask
+        year = month_start.year
+        mask_year = year
+        while mask_year >= 2010 and mask_year not in corn_masks:
+            mask_year -= 1
 
-    if len(results) == 0:
+        if mask_year < 2010:
+            logger.warning(f"  No mask for {year}, skipping")
+            continue
+
+        window_start = max(month_start, pd.Timestamp(start_date)).strftime("%Y-%m-%d")
+        window_end = min(month_start + pd.offsets.MonthBegin(1), pd.Timestamp(end_date)).strftime("%Y-%m-%d")
+        batches.append((month_start.strftime('%Y-%m'), mask_year, window_start, window_end))
+
+    # Months are independent: overlap their getInfo round-trips on the high-volume endpoint
+    logger.info(f"Processing {len(batches)} monthly batches...")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(reduce_month, window_start, window_end, corn_masks[mask_year]): (month, mask_year)
+            for month, mask_year, window_start, window_end in batches
+        }
+        for future in as_completed(futures):
+            month, mask_year = futures[future]
+            try:
+                features = future.result()
+            except Exception as e:
+                logger.warning(f"  Error on {month}: {e}")
+                continue
+
+            if features:
+                frames.append(features_to_frame(features, mask_year))
+                n_records += len(features)
+
+            logger.info(f"  Progress: {month} (mask: {mask_year}) - {n_records} records")
+
+    logger.info(f"Extracted {n_records} records from {count} images")
+
+    if n_records == 0:
         logger.info("✓ Already up to date!")
         return
 
-    new_df = pd.DataFrame(results)
+    # New records exist, so the water deficit step will run. The ETo file does not depend on
+    # the precipitation results: start reading it now so the download overlaps the merge and upload
+    eto_path = "data_raw_new/weather/eto/iowa_corn_eto_20160501_20251031.parquet"
+    with ThreadPoolExecutor(max_workers=1) as eto_loader:
+        eto_future = eto_loader.submit(
+            pd.read_parquet,
+            f"gs://agriguard-ac215-data/{eto_path}",
+            columns=['date', 'fips', 'county_name', 'mean', 'std', 'mask_year'],
+            storage_options={'token': credentials}
+        )
 
-    # Merge with existing
-    if existing_df is not None:
-        logger.info(f"Merging {len(existing_df)} existing + {len(new_df)} new records")
-        final_df = pd.concat([existing_df, new_df], ignore_index=True)
-        final_df = final_df.drop_duplicates(subset=['date','fips'], keep='last')
-        final_df = final_df.sort_values(['date','fips']).reset_index(drop=True)
-    else:
-        final_df = new_df.sort_values(['date','fips']).reset_index(drop=True)
+        new_df = pd.concat(frames, ignore_index=True)
 
-    # Save to GCS
-    buffer = io.BytesIO()
-    final_df.to_parquet(buffer, index=False)
-    buffer.seek(0)
-    blob.upload_from_file(buffer, content_type='application/octet-stream')
+        # Merge with existing
+        if existing_df is not None:
+            logger.info(f"Merging {len(existing_df)} existing + {len(new_df)} new records")
+            # Only existing rows on/after the first new date can collide with the new batch:
+            # dedupe that overlap instead of hashing the whole history
+            overlap = existing_df['date'] >= new_df['date'].min()
+            tail = pd.concat([existing_df[overlap], new_df], ignore_index=True)
+            tail = tail.drop_duplicates(subset=['date','fips'], keep='last')
+            # The stored history is written sorted and every untouched row predates the tail,
+            # so only the tail needs sorting before it is appended
+            head = existing_df[~overlap]
+            if not head['date'].is_monotonic_increasing:
+                head = head.sort_values(['date','fips'])
+            tail = tail.sort_values(['date','fips'])
+            final_df = pd.concat([head, tail], ignore_index=True)
+        else:
+            final_df = new_df.sort_values(['date','fips']).reset_index(drop=True)
 
-    logger.info("=" * 70)
-    logger.info(f"✓ PRECIPITATION COMPLETE!")
-    logger.info(f"📊 Total records: {len(final_df):,} ({len(new_df):,} new)")
-    logger.info(f"📅 Date range: {final_df['date'].min()} to {final_df['date'].max()}")
-    logger.info(f"💧 Precipitation in mm/day")
-    logger.info(f"🌽 Corn-masked with year-specific CDL data")
-    logger.info(f"📁 gs://agriguard-ac215-data/{gcs_path}")
-    logger.info("=" * 70)
+        # mm/day stats fit comfortably in float32: halves the column bytes written and read back
+        stat_cols = ['mean', 'std', 'min', 'max']
+        final_df[stat_cols] = final_df[stat_cols].astype('float32')
 
-    # Calculate Water Deficit
-    logger.info("")
-    logger.info("=" * 70)
-    logger.info("CALCULATING WATER DEFICIT")
-    logger.info("=" * 70)
+        # Save to GCS. Kept as one consolidated file: the cleaner, pipeline_complete and
+        # processing/config.py all read this exact path, so a year-partitioned layout would
+        # need those readers (and the stored history) migrated together
+        buffer = io.BytesIO()
+        final_df.to_parquet(buffer, index=False, **PARQUET_OPTIONS)
+        buffer.seek(0)
+        blob.upload_from_file(
+            buffer,
+            content_type='application/octet-stream',
+            if_generation_match=generation,
+            checksum='crc32c',
+            retry=DEFAULT_RETRY.with_deadline(300)
+        )
 
-    eto_path = "data_raw_new/weather/eto/iowa_corn_eto_20160501_20251031.parquet"
-    eto_df = pd.read_parquet(io.BytesIO(bucket.blob(eto_path).download_as_bytes()))
+        logger.info("=" * 70)
+        logger.info(f"✓ PRECIPITATION COMPLETE!")
+        logger.info(f"📊 Total records: {len(final_df):,} ({len(new_df):,} new)")
+        logger.info(f"📅 Date range: {final_df['date'].min()} to {final_df['date'].max()}")
+        logger.info(f"💧 Precipitation in mm/day")
+        logger.info(f"🌽 Corn-masked with year-specific CDL data")
+        logger.info(f"📁 gs://agriguard-ac215-data/{gcs_path}")
+        logger.info("=" * 70)
+
+        # Calculate Water Deficit
+        logger.info("")
+        logger.info("=" * 70)
+        logger.info("CALCULATING WATER DEFICIT")
+        logger.info("=" * 70)
+
+        eto_df = eto_future.result()
     logger.info(f"✓ Loaded {len(eto_df):,} ETo records")
 
-    merged = eto_df.merge(final_df, on=['date', 'fips'], suffixes=('_eto', '_pr'))
-    logger.info(f"✓ Merged {len(merged):,} records")
+    # Align both sides on their shared (date, fips) keys and build the deficit table
+    # straight from the aligned arrays: no intermediate joined frame is materialized.
+    # get_indexer needs unique keys, so repeated (date, fips) records keep the last one
+    eto_idx = eto_df.drop_duplicates(['date', 'fips'], keep='last').set_index(['date', 'fips'])
+    pr_idx = final_df.drop_duplicates(['date', 'fips'], keep='last').set_index(['date', 'fips'])
+    keys = eto_idx.index.intersection(pr_idx.index)
+    eto_rows = eto_idx.index.get_indexer(keys)
+    pr_rows = pr_idx.index.get_indexer(keys)
+    logger.info(f"✓ Merged {len(keys):,} records")
 
+    eto_mean = eto_idx['mean'].to_numpy()[eto_rows]
+    pr_mean = pr_idx['mean'].to_numpy()[pr_rows]
+    # Subtract straight into the stored float32 column (no float64 temporary + downcast copy)
+    water_deficit = np.empty(len(keys), dtype='float32')
+    np.subtract(eto_mean, pr_mean, out=water_deficit)
     deficit_df = pd.DataFrame({
-        'date': merged['date'],
-        'fips': merged['fips'],
-        'county_name': merged['county_name_eto'],
-        'eto_mean': merged['mean_eto'],
-        'pr_mean': merged['mean_pr'],
-        'water_deficit': merged['mean_eto'] - merged['mean_pr'],
-        'eto_std': merged['std_eto'],
-        'pr_std': merged['std_pr'],
-        'mask_year': merged['mask_year_eto']
+        'date': keys.get_level_values('date'),
+        'fips': keys.get_level_values('fips'),
+        'county_name': eto_idx['county_name'].to_numpy()[eto_rows],
+        'eto_mean': eto_mean,
+        'pr_mean': pr_mean,
+        'water_deficit': water_deficit,
+        'eto_std': eto_idx['std'].to_numpy()[eto_rows],
+        'pr_std': pr_idx['std'].to_numpy()[pr_rows],
+        'mask_year': eto_idx['mask_year'].to_numpy()[eto_rows]
     })
+    deficit_cols = ['eto_mean', 'pr_mean', 'eto_std', 'pr_std']
+    deficit_df[deficit_cols] = deficit_df[deficit_cols].astype('float32')
 
     deficit_df = deficit_df.sort_values(['date', 'fips']).reset_index(drop=True)
 
     total = len(deficit_df)
-    surplus = (deficit_df['water_deficit'] < 0).sum()
-    normal = ((deficit_df['water_deficit'] >= 0) & (deficit_df['water_deficit'] <= 2)).sum()
-    moderate = ((deficit_df['water_deficit'] > 2) & (deficit_df['water_deficit'] <= 4)).sum()
-    high = ((deficit_df['water_deficit'] > 4) & (deficit_df['water_deficit'] <= 6)).sum()
-    severe = (deficit_df['water_deficit'] > 6).sum()
+    # Stress buckets in one pass: <0 | [0, 2] | (2, 4] | (4, 6] | >6 (NaN counted in none)
+    deficit = deficit_df['water_deficit'].to_numpy(dtype='float64')
+    deficit = deficit[~np.isnan(deficit)]
+    edges = [0.0, np.nextafter(2.0, np.inf), np.nextafter(4.0, np.inf), np.nextafter(6.0, np.inf)]
+    surplus, normal, moderate, high, severe = np.bincount(np.digitize(deficit, edges), minlength=5)
 
     logger.info(f"✓ Calculated {len(deficit_df):,} water deficit records")
     logger.info(f"  Mean: {deficit_df['water_deficit'].mean():.2f} mm/day")
@@ -209,9 +312,18 @@ def main():
 
     deficit_path = "data_raw_new/weather/water_deficit/iowa_corn_water_deficit_20160501_20251031.parquet"
     buffer = io.BytesIO()
-    deficit_df.to_parquet(buffer, index=False)
+    deficit_df.to_parquet(buffer, index=False, **PARQUET_OPTIONS)
     buffer.seek(0)
-    bucket.blob(deficit_path).upload_from_file(buffer, content_type='application/octet-stream')
+    deficit_blob = bucket.get_blob(deficit_path, chunk_size=UPLOAD_CHUNK_SIZE)
+    deficit_generation = deficit_blob.generation if deficit_blob is not None else 0
+    deficit_blob = deficit_blob or bucket.blob(deficit_path, chunk_size=UPLOAD_CHUNK_SIZE)
+    deficit_blob.upload_from_file(
+        buffer,
+        content_type='application/octet-stream',
+        if_generation_match=deficit_generation,
+        checksum='crc32c',
+        retry=DEFAULT_RETRY.with_deadline(300)
+    )
 
     logger.info("")
     logger.info("=" * 70)
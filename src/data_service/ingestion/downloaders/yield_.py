@@ -1,13 +1,109 @@
 """USDA NASS Corn Yields - Download and Archive (2010-2025)"""
-import pandas as pd, logging, sys, io, os
+import pandas as pd, logging, sys, io, os, asyncio
 from google.cloud import storage
+from google.api_core.exceptions import NotFound
 import google.auth
 from datetime import datetime
-import requests
+import aiohttp
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# USDA NASS API endpoint
+BASE_URL = "https://quickstats.nass.usda.gov/api/api_GET"
+
+# Pre-parquet archive, read only when the parquet file does not exist yet
+LEGACY_CSV_PATH = "data_raw/yields/iowa_corn_yields_2010_2025.csv"
+
+# NASS record field -> archive column, and the default used when a field is absent
+NASS_COLUMNS = {
+    'year': 'year',
+    'state_name': 'state',
+    'state_fips_code': 'state_fips',
+    'county_name': 'county',
+    'county_code': 'county_fips',
+    'Value': 'yield_bu_per_acre',
+    'unit_desc': 'unit',
+}
+NASS_DEFAULTS = {
+    'state': 'IOWA',
+    'state_fips': '19',
+    'county': '',
+    'county_fips': '',
+    'yield_bu_per_acre': '',
+    'unit': 'BU / ACRE',
+}
+
+# Transient NASS responses worth retrying (rate limiting / gateway errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+async def fetch_year(session, semaphore, year, params, retries=3):
+    """Fetch one year of Iowa county corn yields from NASS QuickStats"""
+    async with semaphore:
+        for attempt in range(retries + 1):
+            wait = 0.5 * 2 ** attempt
+            try:
+                async with session.get(BASE_URL, params={**params, 'year': str(year)}) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        logger.warning(f"  {year} - HTTP {response.status}, retrying in {wait}s")
+                        await asyncio.sleep(wait)
+                        continue
+                    response.raise_for_status()
+                    return await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"  {year} - {type(e).__name__}, retrying in {wait}s")
+                await asyncio.sleep(wait)
+
+async def fetch_years(years, params):
+    """Fetch all years concurrently, at most 8 in flight to respect NASS rate limits"""
+    semaphore = asyncio.Semaphore(8)
+    timeout = aiohttp.ClientTimeout(total=30)
+    # Keep-alive pool shared by every year: one TLS handshake per connection, not per request
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        tasks = [fetch_year(session, semaphore, year, params) for year in years]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+def load_existing(bucket, gcs_path, legacy_csv_path=LEGACY_CSV_PATH):
+    """Load the consolidated yields archive, falling back to the legacy CSV; None if neither exists"""
+    # Download directly and treat NotFound as "no file yet" (no separate exists() round-trip);
+    # the pre-parquet CSV archive is read once so its years are not downloaded again
+    try:
+        existing_df = pd.read_parquet(io.BytesIO(bucket.blob(gcs_path).download_as_bytes()))
+        logger.info("Found existing yields file, checking coverage...")
+    except NotFound:
+        try:
+            existing_df = pd.read_csv(
+                io.StringIO(bucket.blob(legacy_csv_path).download_as_text()),
+                dtype={'state_fips': str, 'county_fips': str, 'fips': str}
+            )
+            logger.info("Found legacy CSV yields file, checking coverage...")
+        except NotFound:
+            existing_df = None
+    return existing_df
+
+def save_archive(blob, final_df):
+    """Write the consolidated yields parquet, recording the years it covers in its metadata"""
+    # Compact dtypes for the archive: small ints/floats and dictionary-encoded labels
+    # (FIPS codes stay strings so their leading zeros survive)
+    final_df = final_df.astype({
+        'year': 'int16',
+        'yield_bu_per_acre': 'float32',
+        'state': 'category',
+        'county': 'category',
+        'unit': 'category',
+    })
+
+    buffer = io.BytesIO()
+    final_df.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+    # Upload straight from the buffer (getvalue() would copy the whole file first)
+    buffer.seek(0)
+    blob.metadata = {'years': ','.join(str(y) for y in sorted(final_df['year'].unique()))}
+    blob.upload_from_file(buffer, content_type='application/octet-stream')
+    return final_df
+
 def main():
     """Download and archive USDA NASS corn yields"""
     
@@ -23,32 +119,47 @@ def main():
 
     logger.info("✓ Initialized")
 
+    # Target years
+    start_year = 2010
+    end_year = 2025
+    target_years = list(range(start_year, end_year + 1))
+
     # Check existing consolidated file
-    gcs_path = "data_raw/yields/iowa_corn_yields_2010_2025.csv"
-    blob = bucket.blob(gcs_path)
+    gcs_path = "data_raw/yields/iowa_corn_yields_2010_2025.parquet"
+    blob = bucket.get_blob(gcs_path) or bucket.blob(gcs_path)
 
-    if blob.exists():
-        logger.info("Found existing yields file, checking coverage...")
-        existing_df = pd.read_csv(io.StringIO(blob.download_as_text()))
+    # The archive records the years it covers in its object metadata, so a steady-state
+    # run is answered by the metadata GET alone, without downloading the file
+    covered_years = (blob.metadata or {}).get('years')
+    if covered_years and set(target_years) <= {int(y) for y in covered_years.split(',')}:
+        logger.info(f"Existing years: {covered_years}")
+        logger.info("✓ ALL YEARS COMPLETE!")
+        return
+
+    existing_df = load_existing(bucket, gcs_path)
+
+    if existing_df is not None:
         existing_years = sorted(existing_df['year'].unique())
         logger.info(f"Existing years: {existing_years}")
     else:
-        existing_df = None
         existing_years = []
 
-    # Target years
-    start_year = 2010
-    end_year = 2025
-    target_years = list(range(start_year, end_year + 1))
     missing_years = [y for y in target_years if y not in existing_years]
 
     if not missing_years:
+        if blob.generation is None:
+            # Complete coverage came from the legacy CSV: migrate it to the parquet archive
+            logger.info(f"Migrating {len(existing_df):,} records from the legacy CSV...")
+            save_archive(blob, existing_df)
+        else:
+            # Archive written before coverage metadata existed: record it for the next run
+            blob.metadata = {'years': ','.join(str(y) for y in existing_years)}
+            blob.patch()
         logger.info("✓ ALL YEARS COMPLETE!")
         return
 
     logger.info(f"Will download {len(missing_years)} missing years: {missing_years}")
 
-    # USDA NASS API endpoint
     # Get API key from environment variable or use None for public access
     api_key = os.getenv('NASS_API_KEY')
     if not api_key:
@@ -57,63 +168,59 @@ def main():
         api_key = None
     else:
         logger.info("✓ Using NASS API key from environment")
+
+    params = {
+        'commodity_desc': 'CORN',
+        'data_item': 'CORN, GRAIN - YIELD, MEASURED IN BU / ACRE',
+        'geographic_level': 'COUNTY',
+        'state_name': 'IOWA',
+        'format': 'CSV'
+    }
     
-    base_url = "https://quickstats.nass.usda.gov/api/api_GET"
+    # Add API key if available
+    if api_key:
+        params['key'] = api_key
+
+    # Years are independent requests: overlap them instead of waiting on each in turn
+    logger.info(f"\nDownloading yields for {len(missing_years)} years...")
+    responses = asyncio.run(fetch_years(missing_years, params))
 
-    all_results = []
+    year_frames = []
 
-    for year in missing_years:
+    for year, text in zip(missing_years, responses):
         try:
-            logger.info(f"\nDownloading yields for {year}...")
+            if isinstance(text, Exception):
+                raise text
             
-            params = {
-                'commodity_desc': 'CORN',
-                'data_item': 'CORN, GRAIN - YIELD, MEASURED IN BU / ACRE',
-                'geographic_level': 'COUNTY',
-                'state_name': 'IOWA',
-                'year': year,
-                'format': 'JSON'
-            }
+            if not text.strip():
+                logger.warning(f"  No data for {year}")
+                continue
             
-            # Add API key if available
-            if api_key:
-                params['key'] = api_key
+            # Parse the CSV body straight into the year's frame, keeping only the archived
+            # fields (no intermediate list of per-record dicts as with the JSON format)
+            year_df = pd.read_csv(io.StringIO(text), usecols=lambda c: c in NASS_COLUMNS, dtype=str)
             
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            # The callable usecols silently skips absent headers: a renamed NASS column
+            # would otherwise be filled with defaults below instead of failing
+            missing_columns = set(NASS_COLUMNS) - set(year_df.columns)
+            if missing_columns:
+                raise ValueError(f"NASS CSV is missing expected columns: {sorted(missing_columns)}")
             
-            if 'data' not in data or len(data['data']) == 0:
+            if year_df.empty:
                 logger.warning(f"  No data for {year}")
                 continue
             
-            records = data['data']
-            logger.info(f"  Found {len(records)} records for {year}")
+            logger.info(f"  Found {len(year_df)} records for {year}")
             
-            # Parse records
-            for record in records:
-                value_str = record.get('Value', '')
-                try:
-                    yield_value = float(value_str) if value_str else None
-                except:
-                    yield_value = None
-                
-                all_results.append({
-                    'year': int(record.get('year', year)),
-                    'state': record.get('state_name', 'IOWA'),
-                    'state_fips': record.get('state_fips_code', '19'),
-                    'county': record.get('county_name', ''),
-                    'county_fips': record.get('county_code', ''),
-                    'yield_bu_per_acre': yield_value,
-                    'unit': record.get('unit_desc', 'BU / ACRE'),
-                    'fips': (record.get('state_fips_code', '19') + 
-                            record.get('county_code', '').zfill(3))
-                })
+            year_df = year_df.reindex(columns=list(NASS_COLUMNS)).rename(columns=NASS_COLUMNS)
+            year_df = year_df.fillna({**NASS_DEFAULTS, 'year': year})
+            year_df['year'] = year_df['year'].astype(int)
+            year_frames.append(year_df)
             
-            logger.info(f"  ✓ {year} - {len(records)} records")
+            logger.info(f"  ✓ {year} - {len(year_df)} records")
         
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
                 logger.error(f"  ✗ {year} - 401 Unauthorized: API key required or invalid")
                 logger.error("    Get API key: https://quickstats.nass.usda.gov/api")
                 logger.error("    Set: export NASS_API_KEY='your_key_here'")
@@ -125,11 +232,17 @@ def main():
             logger.error(f"  ✗ Error downloading {year}: {e}")
             continue
 
-    if not all_results:
+    if not year_frames:
         logger.error("No new data downloaded!")
         return
 
-    new_df = pd.DataFrame(all_results)
+    new_df = pd.concat(year_frames, ignore_index=True)
+
+    # Parse yields and build FIPS codes column-wise once instead of per record
+    # (suppressed values such as '(D)' become NaN)
+    new_df['yield_bu_per_acre'] = pd.to_numeric(new_df['yield_bu_per_acre'].str.strip(), errors='coerce')
+    new_df['fips'] = new_df['state_fips'] + new_df['county_fips'].str.zfill(3)
+
     logger.info(f"\nTotal new records: {len(new_df):,}")
 
     # Merge with existing
@@ -143,8 +256,7 @@ def main():
 
     # Save consolidated file
     logger.info(f"Saving {len(final_df):,} total records...")
-    csv_content = final_df.to_csv(index=False)
-    blob.upload_from_string(csv_content, content_type='text/csv')
+    final_df = save_archive(blob, final_df)
 
     logger.info("")
     logger.info("=" * 70)
@@ -21,6 +21,7 @@ Usage:
 import sys
 import os
 import argparse
+import importlib
 import logging
 from typing import Optional
 
@@ -35,53 +36,24 @@ logger = logging.getLogger(__name__)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 
-def run_mask_downloader():
-    """Download USDA CDL corn masks."""
-    logger.info("Starting mask downloader...")
-    from downloaders import mask
-    mask.main()
+# Source name -> (downloader module, log label). Modules are imported only when selected,
+# so a run pays the import cost (ee, geopandas, aiohttp, ...) of its own source only
+DOWNLOADERS = {
+    'mask': ('downloaders.mask', 'mask'),
+    'yield': ('downloaders.yield_', 'yield'),
+    'ndvi': ('downloaders.ndvi', 'NDVI'),
+    'lst': ('downloaders.lst', 'LST'),
+    'vpd': ('downloaders.vpd', 'VPD'),
+    'eto': ('downloaders.eto', 'ETo'),
+    'precip': ('downloaders.precip', 'Precipitation'),
+}
 
 
-def run_yield_downloader():
-    """Download USDA NASS corn yields."""
-    logger.info("Starting yield downloader...")
-    from downloaders import yield_ as yield_module
-    yield_module.main()
-
-
-def run_ndvi_downloader():
-    """Download MODIS NDVI data."""
-    logger.info("Starting NDVI downloader...")
-    from downloaders import ndvi
-    ndvi.main()
-
-
-def run_lst_downloader():
-    """Download MODIS LST data."""
-    logger.info("Starting LST downloader...")
-    from downloaders import lst
-    lst.main()
-
-
-def run_vpd_downloader():
-    """Download gridMET VPD data."""
-    logger.info("Starting VPD downloader...")
-    from downloaders import vpd
-    vpd.main()
-
-
-def run_eto_downloader():
-    """Download gridMET ETo data."""
-    logger.info("Starting ETo downloader...")
-    from downloaders import eto
-    eto.main()
-
-
-def run_precip_downloader():
-    """Download gridMET Precipitation data."""
-    logger.info("Starting Precipitation downloader...")
-    from downloaders import precip
-    precip.main()
+def run_downloader(source: str):
+    """Import the selected downloader module and run its main()."""
+    module_name, label = DOWNLOADERS[source]
+    logger.info(f"Starting {label} downloader...")
+    importlib.import_module(module_name).main()
 
 
 def main():
@@ -101,7 +73,7 @@ Environment variables can override parameters (see individual scripts).
     
     parser.add_argument(
         '--download',
-        choices=['mask', 'yield', 'ndvi', 'lst', 'vpd', 'eto', 'precip'],
+        choices=list(DOWNLOADERS),
         required=True,
         help='Which data source to download from'
     )
@@ -109,23 +81,7 @@ Environment variables can override parameters (see individual scripts).
     args = parser.parse_args()
     
     try:
-        if args.download == 'mask':
-            run_mask_downloader()
-        elif args.download == 'yield':
-            run_yield_downloader()
-        elif args.download == 'ndvi':
-            run_ndvi_downloader()
-        elif args.download == 'lst':
-            run_lst_downloader()
-        elif args.download == 'vpd':
-            run_vpd_downloader()
-        elif args.download == 'eto':
-            run_eto_downloader()
-        elif args.download == 'precip':
-            run_precip_downloader()
-        else:
-            parser.print_help()
-            sys.exit(1)
+        run_downloader(args.download)
             
         logger.info(f"✓ {args.download.upper()} download completed successfully")
         
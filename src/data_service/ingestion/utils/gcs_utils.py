@@ -10,6 +10,8 @@ import geopandas as gpd
 from google.cloud import storage
 from google.api_core import exceptions
 
+from .parquet import UPLOAD_CHUNK_SIZE
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,7 +63,7 @@ class GCSManager:
         Returns:
             GCS URI of uploaded file
         """
-        blob = self.bucket.blob(gcs_path)
+        blob = self.bucket.blob(gcs_path, chunk_size=UPLOAD_CHUNK_SIZE)
         blob.upload_from_filename(local_path)
         
         uri = f"gs://{self.bucket_name}/{gcs_path}"
@@ -0,0 +1,18 @@
+"""
+Shared parquet writer and upload settings for AgriGuard outputs
+"""
+
+# Write-once/read-many outputs: zstd pages, bounded row groups with min/max statistics
+# for predicate pushdown on date, dictionary-encoded county keys
+PARQUET_OPTIONS = {
+    'engine': 'pyarrow',
+    'compression': 'zstd',
+    'compression_level': 3,
+    'row_group_size': 50_000,
+    'use_dictionary': ['fips', 'county_name'],
+    'write_statistics': True,
+}
+
+# Resumable upload chunk size (must be a multiple of 256 KiB); larger chunks mean
+# fewer round-trips per upload session than the client's default
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
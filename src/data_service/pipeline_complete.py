@@ -5,6 +5,8 @@ import logging
 from datetime import datetime
 import time
 
+from processing.cleaner.features import read_raw_indicators, build_daily_frame, aggregate_weekly, county_names
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -80,13 +82,13 @@ class DataPipeline:
             logger.info("\n" + "=" * 80)
             logger.info("✅ PIPELINE COMPLETE - ALL STAGES PASSED")
             logger.info("=" * 80)
-            logger.info(f"Daily records: {len(daily_df):,}")
-            logger.info(f"Weekly records: {len(weekly_df):,}")
-            logger.info(f"Execution time: {datetime.now().isoformat()}")
+            logger.info("Daily records: %d", len(daily_df))
+            logger.info("Weekly records: %d", len(weekly_df))
+            logger.info("Execution time: %s", datetime.now().isoformat())
             logger.info("=" * 80)
             
         except Exception as e:
-            logger.error(f"❌ Pipeline failed at: {str(e)}")
+            logger.error("❌ Pipeline failed at: %s", e)
             raise
     
     # ============================================================================
@@ -97,58 +99,37 @@ class DataPipeline:
         """Stage 1: Load raw data from GCS"""
         logger.info("\n[STEP 1.1] Checking raw data availability...")
         
+        # Log labels for the raw indicators, keyed like RAW_FILES
+        labels = {
+            'ndvi': ('NDVI (MODIS vegetation index)', 'NDVI'),
+            'lst': ('LST (Land surface temperature)', 'LST'),
+            'vpd': ('VPD (Vapor pressure deficit)', 'VPD'),
+            'eto': ('ETo (Reference evapotranspiration)', 'ETo'),
+            'pr': ('Precipitation', 'Precipitation'),
+            'water_deficit': ('Water Deficit (ETo - Precip)', 'Water Deficit'),
+        }
+        
         try:
-            # Check NDVI
-            logger.info("  → NDVI (MODIS vegetation index)")
-            ndvi = pd.read_parquet(f'{self.raw_path}/modis/ndvi/iowa_corn_ndvi_20160501_20251031.parquet')
-            logger.info(f"    ✓ NDVI: {len(ndvi):,} records")
-            
-            # Check LST
-            logger.info("  → LST (Land surface temperature)")
-            lst = pd.read_parquet(f'{self.raw_path}/modis/lst/iowa_corn_lst_20160501_20251031.parquet')
-            logger.info(f"    ✓ LST: {len(lst):,} records")
-            
-            # Check VPD
-            logger.info("  → VPD (Vapor pressure deficit)")
-            vpd = pd.read_parquet(f'{self.raw_path}/weather/vpd/iowa_corn_vpd_20160501_20251031.parquet')
-            logger.info(f"    ✓ VPD: {len(vpd):,} records")
-            
-            # Check ETo
-            logger.info("  → ETo (Reference evapotranspiration)")
-            eto = pd.read_parquet(f'{self.raw_path}/weather/eto/iowa_corn_eto_20160501_20251031.parquet')
-            logger.info(f"    ✓ ETo: {len(eto):,} records")
+            logger.info("\n".join(f"  → {description}" for description, _ in labels.values()))
+            raw_data = read_raw_indicators(self.raw_path)
+            logger.info("\n".join(
+                f"    ✓ {label}: {len(raw_data[key]):,} records" for key, (_, label) in labels.items()
+            ))
             
-            # Check Precipitation
-            logger.info("  → Precipitation")
-            pr = pd.read_parquet(f'{self.raw_path}/weather/pr/iowa_corn_pr_20160501_20251031.parquet')
-            logger.info(f"    ✓ Precipitation: {len(pr):,} records")
+            logger.info("\n[STEP 1.2] Raw data validation")
+            logger.info("  Total indicators: 6")
+            logger.info("  Total records ingested: %d", sum(len(df) for df in raw_data.values()))
+            logger.info("  Date range: 2016-05-01 to 2025-10-31")
+            logger.info("  Spatial coverage: 99 Iowa counties")
+            logger.info("✅ Ingestion complete - All raw data available")
             
-            # Check Water Deficit
-            logger.info("  → Water Deficit (ETo - Precip)")
-            water_deficit = pd.read_parquet(f'{self.raw_path}/weather/water_deficit/iowa_corn_water_deficit_20160501_20251031.parquet')
-            logger.info(f"    ✓ Water Deficit: {len(water_deficit):,} records")
-            
-            logger.info(f"\n[STEP 1.2] Raw data validation")
-            logger.info(f"  Total indicators: 6")
-            logger.info(f"  Total records ingested: {len(ndvi) + len(lst) + len(vpd) + len(eto) + len(pr) + len(water_deficit):,}")
-            logger.info(f"  Date range: 2016-05-01 to 2025-10-31")
-            logger.info(f"  Spatial coverage: 99 Iowa counties")
-            logger.info(f"✅ Ingestion complete - All raw data available")
-            
-            return {
-                'ndvi': ndvi,
-                'lst': lst,
-                'vpd': vpd,
-                'eto': eto,
-                'pr': pr,
-                'water_deficit': water_deficit
-            }
+            return raw_data
             
         except FileNotFoundError as e:
-            logger.error(f"❌ Ingestion failed - Missing file: {e}")
+            logger.error("❌ Ingestion failed - Missing file: %s", e)
             raise
         except Exception as e:
-            logger.error(f"❌ Ingestion failed: {e}")
+            logger.error("❌ Ingestion failed: %s", e)
             raise
     
     # ============================================================================
@@ -158,101 +139,29 @@ class DataPipeline:
     def _process_data(self, raw_data):
         """Stage 2: Clean and aggregate data"""
         logger.info("\n[STEP 2.1] Merging indicators into daily dataset...")
-        
-        ndvi = raw_data['ndvi']
-        lst = raw_data['lst']
-        vpd = raw_data['vpd']
-        eto = raw_data['eto']
-        pr = raw_data['pr']
-        water_deficit = raw_data['water_deficit']
-        
-        # Create grid
         logger.info("  Creating complete date×county grid...")
-        dates = []
-        for year in range(2016, 2026):
-            season_dates = pd.date_range(f'{year}-05-01', f'{year}-10-31', freq='D')
-            dates.extend(season_dates)
-        dates = pd.DatetimeIndex(dates)
-        counties = sorted(ndvi['fips'].unique())
-        
-        grid = pd.MultiIndex.from_product([dates, counties], names=['date', 'fips'])
-        df = pd.DataFrame(index=grid).reset_index()
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Add county names
-        county_map = ndvi[['fips', 'county_name']].drop_duplicates().set_index('fips')['county_name'].to_dict()
-        df['county_name'] = df['fips'].map(county_map)
-        
-        # Temporal features
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['doy'] = df['date'].dt.dayofyear
-        season_start = pd.to_datetime(df['year'].astype(str) + '-05-01')
-        df['week_of_season'] = ((df['date'] - season_start).dt.days // 7) + 1
-        
-        # Merge indicators
         logger.info("  Merging 6 indicators...")
+        df = build_daily_frame(raw_data)
+        logger.info("\n".join(
+            f"    ✓ {name}" for name in ['NDVI', 'LST', 'VPD', 'ETo', 'Precip', 'Water Deficit']
+        ))
         
-        for name, data, mean_col, std_col in [
-            ('NDVI', ndvi, 'ndvi_mean', 'ndvi_std'),
-            ('LST', lst, 'lst_mean', 'lst_std'),
-            ('VPD', vpd, 'vpd_mean', 'vpd_std'),
-            ('ETo', eto, 'eto_mean', 'eto_std'),
-            ('Precip', pr, 'pr_mean', 'pr_std'),
-        ]:
-            clean = data[['date', 'fips', 'mean', 'std']].rename(
-                columns={'mean': mean_col, 'std': std_col}
-            )
-            clean['date'] = pd.to_datetime(clean['date'])
-            df = df.merge(clean, on=['date', 'fips'], how='left')
-            logger.info(f"    ✓ {name}")
-        
-        # Water deficit (no std)
-        wd_clean = water_deficit[['date', 'fips', 'water_deficit']].rename(
-            columns={'water_deficit': 'water_deficit_mean'}
-        )
-        wd_clean['water_deficit_std'] = 0
-        wd_clean['date'] = pd.to_datetime(wd_clean['date'])
-        df = df.merge(wd_clean, on=['date', 'fips'], how='left')
-        logger.info(f"    ✓ Water Deficit")
-        
-        # Fill NaNs
-        indicator_cols = [c for c in df.columns if c.endswith('_mean') or c.endswith('_std')]
-        for col in indicator_cols:
-            df[col] = df[col].fillna(0)
-        
-        logger.info(f"\n[STEP 2.2] Creating daily dataset")
-        logger.info(f"  Total daily records: {len(df):,}")
-        logger.info(f"  Date range: {df['date'].min().date()} to {df['date'].max().date()}")
-        logger.info(f"  Counties: {df['fips'].nunique()}")
-        logger.info(f"✅ Daily dataset complete")
+        logger.info("\n[STEP 2.2] Creating daily dataset")
+        logger.info("  Total daily records: %d", len(df))
+        logger.info("  Date range: %s to %s", df['date'].min().date(), df['date'].max().date())
+        logger.info("  Counties: %d", df['fips'].nunique())
+        logger.info("✅ Daily dataset complete")
         
         # Weekly aggregation
-        logger.info(f"\n[STEP 2.3] Creating weekly aggregation...")
-        grouped = df.groupby(['year', 'week_of_season', 'fips', 'county_name'])
+        logger.info("\n[STEP 2.3] Creating weekly aggregation...")
+        weekly_df = aggregate_weekly(df)
         
-        agg_dict = {}
-        for col in df.columns:
-            if col.endswith('_mean'):
-                agg_dict[col] = 'mean'
-            elif col.endswith('_std'):
-                agg_dict[col] = lambda x: np.sqrt(np.mean(x**2))
-        
-        weekly_df = grouped[list(agg_dict.keys())].agg(agg_dict).reset_index()
-        weekly_df['date'] = weekly_df.apply(
-            lambda row: pd.Timestamp(row['year'], 5, 1) + pd.Timedelta(days=7 * (row['week_of_season'] - 1)),
-            axis=1
-        )
-        
-        weekly_df = weekly_df[['date', 'year', 'week_of_season', 'fips', 'county_name'] + 
-                             [c for c in weekly_df.columns if c.endswith('_mean') or c.endswith('_std')]]
-        
-        logger.info(f"  Total weekly records: {len(weekly_df):,}")
-        logger.info(f"✅ Weekly aggregation complete")
+        logger.info("  Total weekly records: %d", len(weekly_df))
+        logger.info("✅ Weekly aggregation complete")
         
         # Climatology
-        logger.info(f"\n[STEP 2.4] Computing climatology...")
-        climatology = df.groupby(['week_of_season', 'fips', 'county_name']).agg({
+        logger.info("\n[STEP 2.4] Computing climatology...")
+        climatology = df.groupby(['week_of_season', 'fips'], observed=True).agg({
             'ndvi_mean': ['mean', 'std'],
             'lst_mean': ['mean', 'std'],
             'vpd_mean': ['mean', 'std'],
@@ -260,9 +169,10 @@ class DataPipeline:
             'pr_mean': ['mean', 'std'],
             'water_deficit_mean': ['mean', 'std']
         }).reset_index()
+        climatology.insert(2, ('county_name', ''), climatology['fips'].map(county_names(df)))
         climatology.columns = ['_'.join(col).strip('_') for col in climatology.columns.values]
-        logger.info(f"  Climatology records: {len(climatology):,}")
-        logger.info(f"✅ Processing complete")
+        logger.info("  Climatology records: %d", len(climatology))
+        logger.info("✅ Processing complete")
         
         return df, weekly_df
     
@@ -281,7 +191,7 @@ class DataPipeline:
         logger.info("\n[STEP 3.1] Schema validation...")
         is_valid, errors = self.schema_validator.validate_schema(daily_df, 'daily')
         if not is_valid:
-            logger.error(f"❌ Schema validation failed: {errors}")
+            logger.error("❌ Schema validation failed: %s", errors)
             raise ValueError(f"Schema validation failed: {errors}")
         logger.info("  ✓ All required columns present")
         logger.info("  ✓ Data types correct")
@@ -290,36 +200,40 @@ class DataPipeline:
         logger.info("\n[STEP 3.2] Quality checks...")
         is_valid, violations = self.quality_checker.check_value_ranges(daily_df)
         if not is_valid:
-            logger.error(f"❌ Quality check failed: {violations}")
+            logger.error("❌ Quality check failed: %s", violations)
             raise ValueError(f"Quality check failed: {violations}")
-        logger.info("  ✓ NDVI: 0.0 - 1.0")
-        logger.info("  ✓ LST: -10 - 50°C")
-        logger.info("  ✓ VPD: 0 - 5 kPa")
-        logger.info("  ✓ ETo: 0 - 15 mm/day")
-        logger.info("  ✓ Precipitation: 0 - 200 mm/day")
+        logger.info(
+            "  ✓ NDVI: 0.0 - 1.0\n"
+            "  ✓ LST: -10 - 50°C\n"
+            "  ✓ VPD: 0 - 5 kPa\n"
+            "  ✓ ETo: 0 - 15 mm/day\n"
+            "  ✓ Precipitation: 0 - 200 mm/day"
+        )
         logger.info("✅ Value ranges valid")
         
         logger.info("\n[STEP 3.3] Completeness check...")
         is_valid, completeness = self.quality_checker.check_completeness(daily_df, min_completeness=0.95)
         if not is_valid:
-            logger.error(f"❌ Completeness below 95%: {completeness*100:.1f}%")
+            logger.error("❌ Completeness below 95%%: %.1f%%", completeness * 100)
             raise ValueError(f"Completeness check failed")
-        logger.info(f"  Data completeness: {completeness*100:.1f}%")
+        logger.info("  Data completeness: %.1f%%", completeness * 100)
         logger.info("✅ Completeness validated")
         
         logger.info("\n[STEP 3.4] Drift detection...")
         try:
             drift_report = self.drift_detector.detect_drift(daily_df)
-            logger.info(f"  Drift status: {drift_report}")
+            logger.info("  Drift status: %s", drift_report)
             logger.info("✅ Drift detection complete")
         except Exception as e:
-            logger.warning(f"⚠️  Drift detection warning: {e}")
+            logger.warning("⚠️  Drift detection warning: %s", e)
         
         logger.info("\n[STEP 3.5] Data quality summary...")
-        for indicator in ['ndvi_mean', 'lst_mean', 'vpd_mean', 'eto_mean', 'pr_mean', 'water_deficit_mean']:
-            non_zero = (daily_df[indicator] > 0).sum()
-            pct = non_zero / len(daily_df) * 100
-            logger.info(f"  {indicator}: {pct:.1f}% non-zero")
+        indicators = ['ndvi_mean', 'lst_mean', 'vpd_mean', 'eto_mean', 'pr_mean', 'water_deficit_mean']
+        # Positive share of every indicator from one 2-D comparison and column-wise mean
+        pcts = (daily_df[indicators].to_numpy() > 0).mean(axis=0) * 100
+        logger.info("\n".join(
+            f"  {indicator}: {pct:.1f}% non-zero" for indicator, pct in zip(indicators, pcts)
+        ))
         
         logger.info("\n✅ ALL VALIDATIONS PASSED")
     
@@ -327,7 +241,7 @@ class DataPipeline:
         """Basic schema validation (fallback)"""
         missing_cols = set(self.expected_columns['daily']) - set(df.columns)
         if missing_cols:
-            logger.error(f"❌ Missing columns: {missing_cols}")
+            logger.error("❌ Missing columns: %s", missing_cols)
             raise ValueError(f"Missing columns: {missing_cols}")
         logger.info("✅ Schema validation passed")
 
@@ -4,6 +4,11 @@ from google.cloud import storage
 import logging
 from datetime import datetime
 
+from .features import read_raw_indicators, season_dates, build_daily_frame, aggregate_weekly, county_names
+
+# Writer settings shared with the ingestion downloaders
+from ingestion.utils.parquet import PARQUET_OPTIONS
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -90,98 +95,14 @@ class DataCleaner:
     def create_daily_clean_data(self):
         """Load and merge all indicators into daily table"""
         
-        # Load raw data
-        logger.info("  Loading NDVI...")
-        ndvi = pd.read_parquet(f'{self.raw_path}/modis/ndvi/iowa_corn_ndvi_20160501_20251031.parquet')
-        
-        logger.info("  Loading LST...")
-        lst = pd.read_parquet(f'{self.raw_path}/modis/lst/iowa_corn_lst_20160501_20251031.parquet')
-        
-        logger.info("  Loading VPD...")
-        vpd = pd.read_parquet(f'{self.raw_path}/weather/vpd/iowa_corn_vpd_20160501_20251031.parquet')
-        
-        logger.info("  Loading ETo...")
-        eto = pd.read_parquet(f'{self.raw_path}/weather/eto/iowa_corn_eto_20160501_20251031.parquet')
-        
-        logger.info("  Loading Precipitation...")
-        pr = pd.read_parquet(f'{self.raw_path}/weather/pr/iowa_corn_pr_20160501_20251031.parquet')
-        
-        logger.info("  Loading Water Deficit...")
-        water_deficit = pd.read_parquet(f'{self.raw_path}/weather/water_deficit/iowa_corn_water_deficit_20160501_20251031.parquet')
-        
-        # Create complete date × county grid
-        logger.info("  Creating date×county grid...")
-        dates = []
-        for year in range(2016, 2026):
-            season_dates = pd.date_range(f'{year}-05-01', f'{year}-10-31', freq='D')
-            dates.extend(season_dates)
-        dates = pd.DatetimeIndex(dates)
-        counties = sorted(ndvi['fips'].unique())
-        
-        logger.info(f"  Grid: {len(dates)} dates × {len(counties)} counties = {len(dates) * len(counties):,} rows")
-        
-        grid = pd.MultiIndex.from_product([dates, counties], names=['date', 'fips'])
-        df = pd.DataFrame(index=grid).reset_index()
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Add county names
-        county_map = ndvi[['fips', 'county_name']].drop_duplicates().set_index('fips')['county_name'].to_dict()
-        df['county_name'] = df['fips'].map(county_map)
-        
-        # Add temporal features
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['doy'] = df['date'].dt.dayofyear
-        
-        # Compute week of season
-        season_start = pd.to_datetime(df['year'].astype(str) + '-05-01')
-        df['week_of_season'] = ((df['date'] - season_start).dt.days // 7) + 1
-        
-        # Merge indicators
-        logger.info("  Merging indicators...")
-        
-        ndvi_clean = ndvi[['date', 'fips', 'mean', 'std']].rename(
-            columns={'mean': 'ndvi_mean', 'std': 'ndvi_std'}
-        )
-        ndvi_clean['date'] = pd.to_datetime(ndvi_clean['date'])
-        df = df.merge(ndvi_clean, on=['date', 'fips'], how='left')
-        
-        lst_clean = lst[['date', 'fips', 'mean', 'std']].rename(
-            columns={'mean': 'lst_mean', 'std': 'lst_std'}
-        )
-        lst_clean['date'] = pd.to_datetime(lst_clean['date'])
-        df = df.merge(lst_clean, on=['date', 'fips'], how='left')
-        
-        vpd_clean = vpd[['date', 'fips', 'mean', 'std']].rename(
-            columns={'mean': 'vpd_mean', 'std': 'vpd_std'}
-        )
-        vpd_clean['date'] = pd.to_datetime(vpd_clean['date'])
-        df = df.merge(vpd_clean, on=['date', 'fips'], how='left')
-        
-        eto_clean = eto[['date', 'fips', 'mean', 'std']].rename(
-            columns={'mean': 'eto_mean', 'std': 'eto_std'}
-        )
-        eto_clean['date'] = pd.to_datetime(eto_clean['date'])
-        df = df.merge(eto_clean, on=['date', 'fips'], how='left')
-        
-        pr_clean = pr[['date', 'fips', 'mean', 'std']].rename(
-            columns={'mean': 'pr_mean', 'std': 'pr_std'}
-        )
-        pr_clean['date'] = pd.to_datetime(pr_clean['date'])
-        df = df.merge(pr_clean, on=['date', 'fips'], how='left')
-        
-        water_deficit_clean = water_deficit[['date', 'fips', 'water_deficit']].rename(
-            columns={'water_deficit': 'water_deficit_mean'}
-        )
-        water_deficit_clean['water_deficit_std'] = 0
-        water_deficit_clean['date'] = pd.to_datetime(water_deficit_clean['date'])
-        df = df.merge(water_deficit_clean, on=['date', 'fips'], how='left')
-        
-        # Fill NaNs
-        indicator_cols = [c for c in df.columns if c.endswith('_mean') or c.endswith('_std')]
-        for col in indicator_cols:
-            df[col] = df[col].fillna(0)
+        logger.info("  Loading NDVI, LST, VPD, ETo, Precipitation, Water Deficit...")
+        raw = read_raw_indicators(self.raw_path)
         
+        logger.info("  Creating date×county grid and merging indicators...")
+        df = build_daily_frame(raw)
+        
+        indicator_cols = [c for c in df.columns if c.endswith('_mean') or c.endswith('_std')]
+        logger.info(f"  Grid: {len(season_dates())} dates × {df['fips'].nunique()} counties = {len(df):,} rows")
         logger.info(f"  ✓ Merged {len(indicator_cols)} indicator columns")
         logger.info(f"  ✓ Final daily dataset: {len(df):,} rows × {len(df.columns)} columns")
         
@@ -249,24 +170,7 @@ class DataCleaner:
     def create_weekly_clean_data(self, daily_df):
         """Aggregate daily data to weekly"""
         
-        grouped = daily_df.groupby(['year', 'week_of_season', 'fips', 'county_name'])
-        
-        agg_dict = {}
-        for col in daily_df.columns:
-            if col.endswith('_mean'):
-                agg_dict[col] = 'mean'
-            elif col.endswith('_std'):
-                agg_dict[col] = lambda x: np.sqrt(np.mean(x**2))
-        
-        weekly_df = grouped[list(agg_dict.keys())].agg(agg_dict).reset_index()
-        
-        weekly_df['date'] = weekly_df.apply(
-            lambda row: pd.Timestamp(row['year'], 5, 1) + pd.Timedelta(days=7 * (row['week_of_season'] - 1)),
-            axis=1
-        )
-        
-        weekly_df = weekly_df[['date', 'year', 'week_of_season', 'fips', 'county_name'] + 
-                             [c for c in weekly_df.columns if c.endswith('_mean') or c.endswith('_std')]]
+        weekly_df = aggregate_weekly(daily_df)
         
         logger.info(f"  ✓ Aggregated to weekly: {len(weekly_df):,} rows")
         
@@ -275,26 +179,33 @@ class DataCleaner:
     def create_climatology(self, daily_df):
         """Compute climatology"""
         
-        climatology = daily_df.groupby(['week_of_season', 'fips', 'county_name']).agg({
-            'ndvi_mean': ['mean', 'std'],
-            'lst_mean': ['mean', 'std'],
-            'vpd_mean': ['mean', 'std'],
-            'eto_mean': ['mean', 'std'],
-            'pr_mean': ['mean', 'std'],
-            'water_deficit_mean': ['mean', 'std']
-        }).reset_index()
+        indicator_cols = ['ndvi_mean', 'lst_mean', 'vpd_mean', 'eto_mean', 'pr_mean', 'water_deficit_mean']
+        
+        # Same stats for every column: one native agg over the selected block
+        climatology = daily_df.groupby(['week_of_season', 'fips'], observed=True)[indicator_cols].agg(
+            ['mean', 'std']
+        ).reset_index()
+        climatology.insert(2, ('county_name', ''), climatology['fips'].map(county_names(daily_df)))
         
         climatology.columns = ['_'.join(col).strip('_') for col in climatology.columns.values]
         
         output_path = f'{self.clean_path}/climatology/climatology.parquet'
         logger.info(f"  Uploading climatology to {output_path}...")
-        climatology.to_parquet(output_path, index=False)
+        climatology.to_parquet(output_path, index=False, **PARQUET_OPTIONS)
         
         logger.info(f"  ✓ Climatology: {len(climatology):,} rows")
     
     def create_metadata(self, daily_df, weekly_df):
         """Create pipeline metadata"""
         
+        # Row-level presence flags for all indicators in one 2-D pass
+        indicator_cols = ['ndvi_mean', 'lst_mean', 'vpd_mean', 'eto_mean', 'pr_mean', 'water_deficit_mean']
+        values = daily_df[indicator_cols].to_numpy()
+        present = values > 0
+        present[:, 4] = values[:, 4] >= 0  # zero precipitation is a valid observation
+        present[:, 5] = values[:, 5] != 0  # deficit can be negative (surplus)
+        completeness = present.mean(axis=0)
+        
         metadata = {
             'pipeline_run_date': datetime.now().isoformat(),
             'ms5_validation_enabled': VALIDATION_ENABLED,
@@ -305,12 +216,8 @@ class DataCleaner:
             'date_range_end': daily_df['date'].max().strftime('%Y-%m-%d'),
             'indicators': ['ndvi', 'lst', 'vpd', 'eto', 'pr', 'water_deficit'],
             'data_completeness': {
-                'ndvi': (daily_df['ndvi_mean'] > 0).sum() / len(daily_df),
-                'lst': (daily_df['lst_mean'] > 0).sum() / len(daily_df),
-                'vpd': (daily_df['vpd_mean'] > 0).sum() / len(daily_df),
-                'eto': (daily_df['eto_mean'] > 0).sum() / len(daily_df),
-                'pr': (daily_df['pr_mean'] >= 0).sum() / len(daily_df),
-                'water_deficit': (daily_df['water_deficit_mean'] != 0).sum() / len(daily_df)
+                name: float(pct)
+                for name, pct in zip(['ndvi', 'lst', 'vpd', 'eto', 'pr', 'water_deficit'], completeness)
             }
         }
         
@@ -0,0 +1,151 @@
+"""
+Daily/weekly feature construction shared by DataCleaner and DataPipeline
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Raw indicator parquets (relative to the raw data root), keyed by indicator
+RAW_FILES = {
+    'ndvi': 'modis/ndvi/iowa_corn_ndvi_20160501_20251031.parquet',
+    'lst': 'modis/lst/iowa_corn_lst_20160501_20251031.parquet',
+    'vpd': 'weather/vpd/iowa_corn_vpd_20160501_20251031.parquet',
+    'eto': 'weather/eto/iowa_corn_eto_20160501_20251031.parquet',
+    'pr': 'weather/pr/iowa_corn_pr_20160501_20251031.parquet',
+    'water_deficit': 'weather/water_deficit/iowa_corn_water_deficit_20160501_20251031.parquet',
+}
+
+# Indicators carrying mean/std columns (water deficit has a single value column)
+STAT_INDICATORS = ['ndvi', 'lst', 'vpd', 'eto', 'pr']
+
+
+def read_raw_indicators(raw_path):
+    """Load the six raw indicator frames from GCS, keyed like RAW_FILES"""
+    # Only the columns the merge uses (NDVI also supplies county names)
+    indicator_columns = ['date', 'fips', 'mean', 'std']
+    raw_columns = {key: indicator_columns for key in RAW_FILES}
+    raw_columns['ndvi'] = indicator_columns + ['county_name']
+    raw_columns['water_deficit'] = ['date', 'fips', 'water_deficit']
+
+    # Only rows inside the grid's 2016-2025 window. Every downloader writes `date` as ISO
+    # 'YYYY-MM-DD' text, which orders like dates, so the bounds are string literals and row
+    # groups outside them are skipped from their min/max statistics
+    date_window = [('date', '>=', '2016-05-01'), ('date', '<=', '2025-10-31')]
+
+    # Independent GCS reads: overlap them on a thread pool instead of waiting on each in turn
+    with ThreadPoolExecutor(max_workers=len(RAW_FILES)) as executor:
+        futures = {
+            key: executor.submit(pd.read_parquet, f'{raw_path}/{path}',
+                                 columns=raw_columns[key], filters=date_window)
+            for key, path in RAW_FILES.items()
+        }
+        raw = {key: future.result() for key, future in futures.items()}
+
+    # Indicator precision fits comfortably in float32; halves the bytes moved by
+    # every join, groupby and validation scan downstream
+    for key, raw_df in raw.items():
+        value_cols = ['water_deficit'] if key == 'water_deficit' else ['mean', 'std']
+        raw_df[value_cols] = raw_df[value_cols].astype('float32')
+
+    return raw
+
+
+@lru_cache(maxsize=1)
+def season_dates():
+    """Growing-season days (May 1 - Oct 31, 2016-2025); invariant, so built once per process"""
+    dates = np.concatenate([
+        pd.date_range(f'{year}-05-01', f'{year}-10-31', freq='D').values
+        for year in range(2016, 2026)
+    ])
+    dates.flags.writeable = False
+    return dates
+
+
+def build_daily_frame(raw):
+    """Complete date×county grid with temporal features and all indicators joined on"""
+    ndvi = raw['ndvi']
+    dates = season_dates()
+    counties = np.sort(ndvi['fips'].unique())
+
+    # Date-major product as flat typed columns (no MultiIndex tuple materialization)
+    df = pd.DataFrame({
+        'date': np.repeat(dates, len(counties)),
+        'fips': np.tile(counties, len(dates)),
+    })
+
+    # Add county names
+    county_map = ndvi[['fips', 'county_name']].drop_duplicates().set_index('fips')['county_name'].to_dict()
+    df['county_name'] = df['fips'].map(county_map)
+
+    # Temporal features, all derived from one datetime64[D] view of the dates with
+    # integer arithmetic (no per-field .dt passes, no per-row string parsing)
+    days = df['date'].to_numpy().astype('datetime64[D]')
+    year_start = days.astype('datetime64[Y]')
+    df['year'] = (year_start.astype('int64') + 1970).astype('uint16')
+    df['month'] = (days.astype('datetime64[M]').astype('int64') % 12 + 1).astype('uint8')
+    df['doy'] = ((days - year_start.astype('datetime64[D]')).astype('int64') + 1).astype('uint16')
+
+    # Week of season counted from May 1 of each date's year
+    season_start = (year_start.astype('datetime64[M]') + np.timedelta64(4, 'M')).astype('datetime64[D]')
+    df['week_of_season'] = (((days - season_start).astype('int64') // 7) + 1).astype('int16')
+
+    # Merge indicators: raw dates are ISO text, parsed once here; each indicator is indexed
+    # and sorted on (date, fips) like the grid, then all six are aligned onto it in a single
+    # join instead of six chained merges that each copy the growing frame
+    indicator_frames = []
+    for prefix in STAT_INDICATORS:
+        clean = raw[prefix][['date', 'fips', 'mean', 'std']].rename(
+            columns={'mean': f'{prefix}_mean', 'std': f'{prefix}_std'}
+        )
+        clean['date'] = pd.to_datetime(clean['date'])
+        indicator_frames.append(clean.set_index(['date', 'fips']).sort_index())
+
+    # Water deficit (no std)
+    wd_clean = raw['water_deficit'][['date', 'fips', 'water_deficit']].rename(
+        columns={'water_deficit': 'water_deficit_mean'}
+    )
+    wd_clean['water_deficit_std'] = np.float32(0)
+    wd_clean['date'] = pd.to_datetime(wd_clean['date'])
+    indicator_frames.append(wd_clean.set_index(['date', 'fips']).sort_index())
+
+    df = df.set_index(['date', 'fips']).join(indicator_frames, how='left').reset_index()
+
+    # Fill NaNs
+    indicator_cols = [c for c in df.columns if c.endswith('_mean') or c.endswith('_std')]
+    df[indicator_cols] = df[indicator_cols].fillna(0)
+
+    # County keys repeat once per day: store them as categoricals (int codes + one
+    # copy of each label) so downstream groupbys factorize small ints instead of strings
+    df[['fips', 'county_name']] = df[['fips', 'county_name']].astype('category')
+
+    return df
+
+
+def county_names(daily_df):
+    """fips -> county_name lookup (one row per county)"""
+    return daily_df[['fips', 'county_name']].drop_duplicates('fips').set_index('fips')['county_name']
+
+
+def aggregate_weekly(daily_df):
+    """Aggregate daily data to weekly (means of means, RMS of stds)"""
+    # county_name is functionally dependent on fips: group on fips alone and map names back
+    group_keys = ['year', 'week_of_season', 'fips']
+    value_cols = [c for c in daily_df.columns if c.endswith('_mean') or c.endswith('_std')]
+    std_cols = [c for c in value_cols if c.endswith('_std')]
+
+    # Weekly std is the RMS of daily stds: square once up front so every
+    # column reduces with the built-in mean (no Python lambda per group)
+    work = daily_df[group_keys + value_cols].assign(**{c: daily_df[c].pow(2) for c in std_cols})
+    weekly_df = work.groupby(group_keys, observed=True)[value_cols].mean().reset_index()
+    weekly_df.insert(3, 'county_name', weekly_df['fips'].map(county_names(daily_df)))
+    weekly_df[std_cols] = np.sqrt(weekly_df[std_cols])
+
+    # Week start = May 1 of the year + 7 days per elapsed week, as one datetime64 broadcast
+    years = weekly_df['year'].to_numpy().astype('int64') - 1970
+    season_start = (years.astype('datetime64[Y]').astype('datetime64[M]') + np.timedelta64(4, 'M')).astype('datetime64[D]')
+    weeks = weekly_df['week_of_season'].to_numpy().astype('int64')
+    weekly_df['date'] = (season_start + 7 * (weeks - 1)).astype('datetime64[ns]')
+
+    return weekly_df[['date', 'year', 'week_of_season', 'fips', 'county_name'] + value_cols]
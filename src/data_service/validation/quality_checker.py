@@ -37,22 +37,28 @@ class QualityChecker:
         """
         violations = {}
         
-        for col, (min_val, max_val) in self.VALID_RANGES.items():
-            if col in df.columns:
-                # Skip NaN values
-                valid_data = df[col].dropna()
-                
-                out_of_range = (
-                    (valid_data < min_val) | (valid_data > max_val)
-                ).sum()
-                
-                if out_of_range > 0:
-                    violations[col] = {
-                        'count': out_of_range,
-                        'pct': (out_of_range / len(valid_data)) * 100,
-                        'min': valid_data.min(),
-                        'max': valid_data.max(),
-                    }
+        cols = [col for col in self.VALID_RANGES if col in df.columns]
+        if cols:
+            # One broadcast comparison over all checked columns against per-column bounds
+            # (NaN compares False on both sides, so missing values never count)
+            values = df[cols].to_numpy(dtype='float64')
+            lower = np.array([self.VALID_RANGES[col][0] for col in cols], dtype='float64')
+            upper = np.array([self.VALID_RANGES[col][1] for col in cols], dtype='float64')
+            
+            # OR the upper-bound test into the lower-bound mask in place (no third bool array)
+            mask = np.less(values, lower)
+            np.logical_or(mask, np.greater(values, upper), out=mask)
+            out_of_range = mask.sum(axis=0)
+            n_valid = values.shape[0] - np.isnan(values).sum(axis=0)
+            
+            for i in np.flatnonzero(out_of_range):
+                col = cols[i]
+                violations[col] = {
+                    'count': out_of_range[i],
+                    'pct': (out_of_range[i] / n_valid[i]) * 100,
+                    'min': df[col].min(),
+                    'max': df[col].max(),
+                }
         
         is_valid = len(violations) == 0
         
@@ -80,27 +86,32 @@ class QualityChecker:
         
         outliers = {}
         
-        for col in columns:
-            if col in df.columns:
-                data = df[col].dropna()
-                
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outlier_count = (
-                    (data < lower_bound) | (data > upper_bound)
-                ).sum()
-                
-                if outlier_count > 0:
-                    outliers[col] = {
-                        'count': outlier_count,
-                        'pct': (outlier_count / len(data)) * 100,
-                        'bounds': (lower_bound, upper_bound),
-                    }
+        cols = [col for col in columns if col in df.columns]
+        values = df[cols].to_numpy(dtype='float64')
+        n_valid = (~np.isnan(values)).sum(axis=0)
+        
+        # Columns with no data are skipped
+        keep = np.flatnonzero(n_valid)
+        cols = [cols[i] for i in keep]
+        values, n_valid = values[:, keep], n_valid[keep]
+        
+        if cols:
+            # Quartiles, bounds and outlier counts for all columns at once
+            # (NaN-aware quantiles; NaN compares False, so missing values never count)
+            Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+            IQR = Q3 - Q1
+            
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
+            
+            outlier_counts = ((values < lower_bounds) | (values > upper_bounds)).sum(axis=0)
+            
+            for i in np.flatnonzero(outlier_counts):
+                outliers[cols[i]] = {
+                    'count': outlier_counts[i],
+                    'pct': (outlier_counts[i] / n_valid[i]) * 100,
+                    'bounds': (lower_bounds[i], upper_bounds[i]),
+                }
         
         if outliers:
             logger.warning(f"⚠️  Outliers detected: {outliers}")
@@ -121,14 +132,17 @@ class QualityChecker:
             tuple: (is_valid, completeness_report)
         """
         total_cells = df.shape[0] * df.shape[1]
-        missing_cells = df.isna().sum().sum()
+        # Per-column null counts from non-null counts (one reduction per column, no
+        # full-frame boolean mask, and computed once for both the total and the breakdown)
+        missing_by_column = len(df) - df.count()
+        missing_cells = missing_by_column.sum()
         completeness = 1 - (missing_cells / total_cells)
         
         report = {
             'total_cells': total_cells,
             'missing_cells': missing_cells,
             'completeness': completeness,
-            'by_column': df.isna().sum().to_dict(),
+            'by_column': missing_by_column.to_dict(),
         }
         
         is_valid = completeness >= min_completeness
@@ -14,9 +14,11 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
 from datetime import datetime, timedelta
 import logging
 from enum import Enum
@@ -39,6 +41,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Weekly columns the calculator reads: keys, and the indicators behind the sub-indices
+WEEKLY_KEY_COLUMNS = ['fips', 'county_name', 'week_start', 'week_of_season']
+WEEKLY_INDICATOR_COLUMNS = [
+    'water_deficit_mean', 'pr_sum', 'pr_mean', 'eto_sum', 'eto_mean',
+    'lst_day_1km_mean', 'vpd_mean', 'ndvi_mean', 'et_ensemble_mad_mean',
+]
+
 # ==================== Data Models ====================
 
 class StressLevel(str, Enum):
@@ -113,33 +122,39 @@ class MCSICalculator:
     - Atmospheric Stress: Based on VPD, ETo (demand indicators)
     """
     
+    # Upper index bounds of the healthy/mild/moderate/severe levels (critical above)
+    STRESS_BOUNDS = [20, 40, 60, 80]
+    STRESS_LEVELS = np.array(list(StressLevel), dtype=object)
+    
     def __init__(self):
         """Initialize calculator with thresholds"""
         self.data = None
         self.climatology = None
+        # (week_data, latest_date), built on first use; the data never changes after load
+        self._latest_week = None
+        # fips -> positions of that county's rows in self.data (original order)
+        self._county_rows = {}
         self._load_data()
     
     def _load_data(self):
         """Load clean weekly data and climatology from GCS"""
         try:
-            logger.info("Loading weekly clean data from GCS...")
-            self.data = pd.read_parquet(
-                'gs://agriguard-ac215-data/data_clean/weekly/iowa_corn_weekly_20160501_20251031.parquet'
-            )
-            
-            logger.info("Loading climatology baseline...")
-            try:
-                self.climatology = pd.read_parquet(
-                    'gs://agriguard-ac215-data/data_clean/climatology/daily_normals_2016_2024.parquet'
-                )
-                self.climatology['date'] = pd.to_datetime(self.climatology['date'])
-            except Exception as e:
-                logger.warning(f"Climatology not available: {e}. Proceeding without it.")
-                self.climatology = None
+            logger.info("Loading weekly clean data and climatology baseline from GCS...")
+            # The two files are independent: fetch them concurrently (the GCS download and
+            # parquet decode release the GIL) so startup waits on the slower one, not both
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                weekly_future = executor.submit(self._read_weekly)
+                climatology_future = executor.submit(self._read_climatology)
+                self.data = weekly_future.result()
+                self.climatology = climatology_future.result()
             
             # Ensure date columns are datetime
             self.data['week_start'] = pd.to_datetime(self.data['week_start'])
             
+            # Index rows by county once, so a county lookup takes its own rows
+            # instead of comparing every fips in the table
+            self._county_rows = self.data.groupby('fips', sort=False, observed=True).indices
+            
             logger.info(f"Loaded {len(self.data)} weekly records")
             logger.info(f"Data date range: {self.data['week_start'].min()} to {self.data['week_start'].max()}")
             
@@ -147,221 +162,199 @@ class MCSICalculator:
             logger.error(f"Failed to load data: {e}")
             raise
     
+    def _read_weekly(self) -> pd.DataFrame:
+        """Read the clean weekly aggregates"""
+        # Project to the columns the indices use, so the other indicator/std columns
+        # are never fetched or decoded (absent optional indicators are simply skipped)
+        weekly = ds.dataset(
+            'gs://agriguard-ac215-data/data_clean/weekly/iowa_corn_weekly_20160501_20251031.parquet',
+            format='parquet'
+        )
+        columns = [c for c in WEEKLY_KEY_COLUMNS + WEEKLY_INDICATOR_COLUMNS if c in weekly.schema.names]
+        df = weekly.to_table(columns=columns).to_pandas()
+        
+        # Indicators are single-precision measurements; float32 halves the table and the bytes
+        # every mask/slice moves (the index math still runs in float64, see _indicator)
+        indicators = [c for c in WEEKLY_INDICATOR_COLUMNS if c in df.columns]
+        
+        # ~99 distinct counties: as a categorical, fips comparisons and groupbys work
+        # on small integer codes instead of hashing strings
+        return df.astype({**dict.fromkeys(indicators, 'float32'), 'fips': 'category'})
+    
+    def _read_climatology(self) -> Optional[pd.DataFrame]:
+        """Read the climatology baseline (None if it is not available)"""
+        try:
+            climatology = pd.read_parquet(
+                'gs://agriguard-ac215-data/data_clean/climatology/daily_normals_2016_2024.parquet'
+            )
+            climatology['date'] = pd.to_datetime(climatology['date'])
+            return climatology
+        except Exception as e:
+            logger.warning(f"Climatology not available: {e}. Proceeding without it.")
+            return None
+    
     def get_latest_week(self) -> tuple:
-        """Get the most recent week in the dataset"""
+        """Get the most recent week in the dataset (aggregated once, then cached)"""
         if self.data is None or len(self.data) == 0:
             raise ValueError("No data loaded")
         
-        latest_date = self.data['week_start'].max()
-        week_mask = (self.data['week_start'] >= latest_date - timedelta(days=6)) & \
-                    (self.data['week_start'] <= latest_date)
-        week_data = self.data[week_mask].groupby(['fips', 'county_name', 'week_of_season']).first().reset_index()
+        # Every endpoint defaulting to the latest week asks for this (summary twice per
+        # request); compute the scan + groupby once instead of on every call
+        if self._latest_week is None:
+            latest_date = self.data['week_start'].max()
+            # latest_date is the column max, so the lower bound alone selects the week
+            week_mask = self.data['week_start'] >= latest_date - timedelta(days=6)
+            week_data = self.data[week_mask].groupby(['fips', 'county_name', 'week_of_season'], observed=True).first().reset_index()
+            self._latest_week = (week_data, latest_date)
         
-        return week_data, latest_date
+        return self._latest_week
     
-    def calculate_water_stress_index(self, row: pd.Series) -> tuple:
+    def calculate_water_stress_index(self, df: pd.DataFrame) -> tuple:
         """
-        Calculate Water Stress Index (WSI) 0-100
+        Calculate Water Stress Index (WSI) 0-100 for every row
         
         Based on:
         - water_deficit (primary): Higher deficit = more stress
         - precipitation: Lower precip = more stress
         - ET: High ET without precip = stress
         
-        Returns: (index_value, status, key_driver)
+        Returns: (index_values, statuses, key_drivers), aligned with df rows
         """
-        wsi_components = []
-        weights = {}
-        
         # Component 1: Water Deficit (40% weight)
         # Deficit > 4 mm/day = severe stress for corn
-        if 'water_deficit_mean' in row and pd.notna(row['water_deficit_mean']):
-            deficit = row['water_deficit_mean']
-            # Map: 0 deficit = 0 stress, 6+ = 100 stress (sigmoid-like)
-            deficit_stress = min(100, max(0, (deficit / 6.0) * 100))
-            wsi_components.append(deficit_stress)
-            weights['water_deficit'] = 0.40
+        # Map: 0 deficit = 0 stress, 6+ = 100 stress (sigmoid-like)
+        deficit = self._indicator(df, 'water_deficit_mean')
+        deficit_stress = np.clip((deficit / 6.0) * 100, 0, 100)
         
         # Component 2: Precipitation (35% weight)
         # During growing season, <2 mm/day for multiple days = stress
-        if 'pr_sum' in row and pd.notna(row['pr_sum']):
-            precip = row['pr_sum'] / 7.0  # Convert weekly sum to daily average
-            # Map: >4 mm/day = 0 stress, 0 mm/day = 100 stress
-            precip_stress = min(100, max(0, (1 - precip / 4.0) * 100))
-            wsi_components.append(precip_stress)
-            weights['precipitation'] = 0.35
+        precip = self._indicator(df, 'pr_sum') / 7.0  # Convert weekly sum to daily average
+        # Map: >4 mm/day = 0 stress, 0 mm/day = 100 stress
+        precip_stress = np.clip((1 - precip / 4.0) * 100, 0, 100)
         
         # Component 3: ET (25% weight)
         # High ET without rain = atmospheric demand for water
-        if 'eto_sum' in row and pd.notna(row['eto_sum']):
-            et = row['eto_sum']  # Weekly sum in mm
-            et_daily = et / 7.0  # Convert to daily
-            # High ET (>6 mm/day) = water demand
-            et_stress = min(100, max(0, (et_daily / 8.0) * 100))
-            wsi_components.append(et_stress)
-            weights['et'] = 0.25
-        
-        # Calculate weighted average
-        if wsi_components and weights:
-            total_weight = sum(weights.values())
-            normalized_weights = {k: v / total_weight for k, v in weights.items()}
-            wsi = sum(c * list(normalized_weights.values())[i] 
-                     for i, c in enumerate(wsi_components))
-        else:
-            wsi = 0
+        et_daily = self._indicator(df, 'eto_sum') / 7.0  # Weekly sum in mm -> daily
+        # High ET (>6 mm/day) = water demand
+        et_stress = np.clip((et_daily / 8.0) * 100, 0, 100)
+        
+        wsi = self._weighted_index([(deficit_stress, 0.40), (precip_stress, 0.35), (et_stress, 0.25)])
         
         # Determine status
-        status = self._get_stress_status(wsi)
+        status = self._get_stress_statuses(wsi)
         
-        # Key driver (which component is highest?)
-        if 'deficit_stress' in locals() and deficit_stress > 60:
-            key_driver = "High water deficit"
-        elif 'precip_stress' in locals() and precip_stress > 60:
-            key_driver = "Low precipitation"
-        else:
-            key_driver = "Moderate water stress across indicators"
+        # Key driver (which component is highest?) - NaN (missing) components never qualify
+        key_driver = np.where(
+            deficit_stress > 60, "High water deficit",
+            np.where(precip_stress > 60, "Low precipitation", "Moderate water stress across indicators")
+        )
         
         return wsi, status, key_driver
     
-    def calculate_heat_stress_index(self, row: pd.Series) -> tuple:
+    def calculate_heat_stress_index(self, df: pd.DataFrame) -> tuple:
         """
-        Calculate Heat Stress Index (HSI) 0-100
+        Calculate Heat Stress Index (HSI) 0-100 for every row
         
         Based on:
         - LST (Land Surface Temperature): >35°C = stress, especially during pollination
         - VPD (Vapor Pressure Deficit): High VPD = high evaporative demand
         
-        Returns: (index_value, status, key_driver)
+        Returns: (index_values, statuses, key_drivers), aligned with df rows
         """
-        hsi_components = []
-        weights = {}
-        
         # Component 1: Land Surface Temperature (60% weight)
         # Optimal: 25-30°C, Stress threshold: >35°C
-        if 'lst_day_1km_mean' in row and pd.notna(row['lst_day_1km_mean']):
-            lst = row['lst_day_1km_mean']
-            
-            # Piecewise function
-            if lst < 25:
-                lst_stress = (25 - lst) * 2  # Cold stress (less critical)
-            elif lst <= 32:
-                lst_stress = 0  # Optimal range
-            elif lst <= 38:
-                lst_stress = (lst - 32) * 15  # Heat stress ramp
-            else:
-                lst_stress = min(100, 90 + (lst - 38) * 5)  # Critical
-            
-            hsi_components.append(min(100, lst_stress))
-            weights['lst'] = 0.60
+        lst = self._indicator(df, 'lst_day_1km_mean')
+        
+        # Piecewise function, one digitize pass to pick each row's piece
+        # (right=True puts exactly 25°C in the cold piece, which also scores 0 there)
+        piece = np.digitize(lst, [25, 32, 38], right=True)
+        lst_stress = np.choose(piece, [
+            (25 - lst) * 2,                          # Cold stress (less critical)
+            np.zeros_like(lst),                      # Optimal range
+            (lst - 32) * 15,                         # Heat stress ramp
+            np.minimum(100, 90 + (lst - 38) * 5),    # Critical
+        ])
+        lst_stress = np.where(np.isnan(lst), np.nan, np.minimum(100, lst_stress))
         
         # Component 2: Vapor Pressure Deficit (40% weight)
         # High VPD = low humidity = high evaporative stress
-        if 'vpd_mean' in row and pd.notna(row['vpd_mean']):
-            vpd = row['vpd_mean']
-            # Typical range: 0-3 kPa, >2.5 = stress
-            vpd_stress = min(100, max(0, (vpd / 3.0) * 100))
-            hsi_components.append(vpd_stress)
-            weights['vpd'] = 0.40
-        
-        # Calculate weighted average
-        if hsi_components and weights:
-            total_weight = sum(weights.values())
-            normalized_weights = {k: v / total_weight for k, v in weights.items()}
-            hsi = sum(c * list(normalized_weights.values())[i] 
-                     for i, c in enumerate(hsi_components))
-        else:
-            hsi = 0
+        # Typical range: 0-3 kPa, >2.5 = stress
+        vpd = self._indicator(df, 'vpd_mean')
+        vpd_stress = np.clip((vpd / 3.0) * 100, 0, 100)
+        
+        hsi = self._weighted_index([(lst_stress, 0.60), (vpd_stress, 0.40)])
         
-        status = self._get_stress_status(hsi)
+        status = self._get_stress_statuses(hsi)
         
         # Key driver
-        if 'lst_stress' in locals() and lst_stress > 50:
-            key_driver = f"High temperature ({lst:.1f}°C)"
-        elif 'vpd_stress' in locals() and vpd_stress > 50:
-            key_driver = "High atmospheric dryness"
-        else:
-            key_driver = "Moderate heat stress"
+        key_driver = np.where(
+            lst_stress > 50, [f"High temperature ({t:.1f}°C)" for t in lst],
+            np.where(vpd_stress > 50, "High atmospheric dryness", "Moderate heat stress")
+        )
         
         return hsi, status, key_driver
     
-    def calculate_vegetation_health_index(self, row: pd.Series) -> tuple:
+    def calculate_vegetation_health_index(self, df: pd.DataFrame) -> tuple:
         """
-        Calculate Vegetation Health Index (VHI) 0-100
+        Calculate Vegetation Health Index (VHI) 0-100 for every row
         
         Based on:
         - NDVI: Normalized Difference Vegetation Index
         - Higher NDVI = healthier vegetation
         
-        Returns: (index_value, status, key_driver)
+        Returns: (index_values, statuses, key_drivers), aligned with df rows
         """
-        if 'ndvi_mean' not in row or pd.isna(row['ndvi_mean']):
-            return 0, StressLevel.HEALTHY, "No NDVI data"
-        
-        ndvi = row['ndvi_mean']
+        ndvi = self._indicator(df, 'ndvi_mean')
         
         # NDVI interpretation
         # <0.3 = severe stress, 0.3-0.5 = moderate stress, 0.5-0.7 = mild, >0.7 = healthy
         # Convert to stress (inverse)
-        if ndvi < 0.3:
-            vhi = 100  # Severe stress
-        elif ndvi < 0.5:
-            vhi = 70 - (ndvi - 0.3) / 0.2 * 25  # Moderate
-        elif ndvi < 0.7:
-            vhi = 30 - (ndvi - 0.5) / 0.2 * 20  # Mild
-        else:
-            vhi = max(0, 10 - (ndvi - 0.7) / 0.23 * 10)  # Healthy
-        
-        vhi = min(100, max(0, vhi))
-        status = self._get_stress_status(vhi)
-        
-        key_driver = f"NDVI {ndvi:.3f} (vegetation vigor)"
+        piece = np.digitize(ndvi, [0.3, 0.5, 0.7])
+        vhi = np.choose(piece, [
+            np.full_like(ndvi, 100),                              # Severe stress
+            70 - (ndvi - 0.3) / 0.2 * 25,                         # Moderate
+            30 - (ndvi - 0.5) / 0.2 * 20,                         # Mild
+            np.maximum(0, 10 - (ndvi - 0.7) / 0.23 * 10),         # Healthy
+        ])
+        
+        # No NDVI data scores 0 (healthy)
+        vhi = np.where(np.isnan(ndvi), 0.0, np.clip(vhi, 0, 100))
+        status = self._get_stress_statuses(vhi)
+        
+        key_driver = np.where(
+            np.isnan(ndvi), "No NDVI data",
+            [f"NDVI {v:.3f} (vegetation vigor)" for v in ndvi]
+        )
         
         return vhi, status, key_driver
     
-    def calculate_atmospheric_stress_index(self, row: pd.Series) -> tuple:
+    def calculate_atmospheric_stress_index(self, df: pd.DataFrame) -> tuple:
         """
-        Calculate Atmospheric Stress Index (ASI) 0-100
+        Calculate Atmospheric Stress Index (ASI) 0-100 for every row
         
         Based on:
         - VPD: Vapor Pressure Deficit (atmospheric dryness)
         - ETo: Reference Evapotranspiration (water demand)
         
-        Returns: (index_value, status, key_driver)
+        Returns: (index_values, statuses, key_drivers), aligned with df rows
         """
-        asi_components = []
-        weights = {}
-        
         # Component 1: VPD (50% weight)
-        if 'vpd_mean' in row and pd.notna(row['vpd_mean']):
-            vpd = row['vpd_mean']
-            vpd_stress = min(100, max(0, (vpd / 3.0) * 100))
-            asi_components.append(vpd_stress)
-            weights['vpd'] = 0.50
+        vpd_stress = np.clip((self._indicator(df, 'vpd_mean') / 3.0) * 100, 0, 100)
         
         # Component 2: ETo (50% weight)
         # High ETo = high water demand
-        if 'eto_mean' in row and pd.notna(row['eto_mean']):
-            eto = row['eto_mean']
-            # Typical peak: 6-8 mm/day, >8 = atmospheric stress
-            eto_stress = min(100, max(0, (eto / 10.0) * 100))
-            asi_components.append(eto_stress)
-            weights['eto'] = 0.50
-        
-        if asi_components and weights:
-            total_weight = sum(weights.values())
-            normalized_weights = {k: v / total_weight for k, v in weights.items()}
-            asi = sum(c * list(normalized_weights.values())[i] 
-                     for i, c in enumerate(asi_components))
-        else:
-            asi = 0
+        # Typical peak: 6-8 mm/day, >8 = atmospheric stress
+        eto_stress = np.clip((self._indicator(df, 'eto_mean') / 10.0) * 100, 0, 100)
         
-        status = self._get_stress_status(asi)
-        key_driver = "Atmospheric evaporative demand"
+        asi = self._weighted_index([(vpd_stress, 0.50), (eto_stress, 0.50)])
+        
+        status = self._get_stress_statuses(asi)
+        key_driver = np.full(len(asi), "Atmospheric evaporative demand")
         
         return asi, status, key_driver
     
-    def calculate_composite_stress_index(self, wsi: float, hsi: float, 
-                                         vhi: float, asi: float) -> float:
+    def calculate_composite_stress_index(self, wsi: np.ndarray, hsi: np.ndarray, 
+                                         vhi: np.ndarray, asi: np.ndarray) -> np.ndarray:
         """
         Calculate overall Composite Corn Stress Index (CCSI)
         
@@ -372,20 +365,55 @@ class MCSICalculator:
         - Atmospheric Stress (10%): Supporting factor
         """
         ccsi = (wsi * 0.40) + (hsi * 0.30) + (vhi * 0.20) + (asi * 0.10)
-        return min(100, max(0, ccsi))
-    
-    def _get_stress_status(self, index: float) -> StressLevel:
-        """Convert 0-100 index to stress level"""
-        if index < 20:
-            return StressLevel.HEALTHY
-        elif index < 40:
-            return StressLevel.MILD
-        elif index < 60:
-            return StressLevel.MODERATE
-        elif index < 80:
-            return StressLevel.SEVERE
-        else:
-            return StressLevel.CRITICAL
+        return np.clip(ccsi, 0, 100)
+    
+    def calculate_stress_indices(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate all sub-indices and the composite index for every row of df
+        
+        Returns: DataFrame aligned with df holding each index's value, status and key driver
+        """
+        wsi, wsi_status, wsi_driver = self.calculate_water_stress_index(df)
+        hsi, hsi_status, hsi_driver = self.calculate_heat_stress_index(df)
+        vhi, vhi_status, vhi_driver = self.calculate_vegetation_health_index(df)
+        asi, asi_status, asi_driver = self.calculate_atmospheric_stress_index(df)
+        ccsi = self.calculate_composite_stress_index(wsi, hsi, vhi, asi)
+        
+        return pd.DataFrame({
+            'wsi': wsi, 'wsi_status': wsi_status, 'wsi_driver': wsi_driver,
+            'hsi': hsi, 'hsi_status': hsi_status, 'hsi_driver': hsi_driver,
+            'vhi': vhi, 'vhi_status': vhi_status, 'vhi_driver': vhi_driver,
+            'asi': asi, 'asi_status': asi_status, 'asi_driver': asi_driver,
+            'ccsi': ccsi, 'ccsi_status': self._get_stress_statuses(ccsi),
+        }, index=df.index)
+    
+    @staticmethod
+    def _indicator(df: pd.DataFrame, column: str) -> np.ndarray:
+        """Indicator column as float64 values (all NaN when the column is absent)"""
+        if column not in df:
+            return np.full(len(df), np.nan)
+        return df[column].to_numpy(dtype='float64', na_value=np.nan)
+    
+    @staticmethod
+    def _weighted_index(components: List[tuple]) -> np.ndarray:
+        """
+        Weighted average of (stress_values, weight) components
+        
+        Weights are renormalized per row over the components that are present
+        (not NaN); rows with no component at all score 0.
+        """
+        present = [~np.isnan(stress) for stress, _ in components]
+        total_weight = sum(weight * mask for (_, weight), mask in zip(components, present))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = sum(np.where(mask, stress * (weight / total_weight), 0)
+                        for (stress, weight), mask in zip(components, present))
+        return np.where(total_weight > 0, index, 0.0)
+    
+    def _get_stress_statuses(self, index: np.ndarray) -> np.ndarray:
+        """Convert 0-100 indices to stress levels (one digitize pass over the array)"""
+        # Bands: <20 healthy, <40 mild, <60 moderate, <80 severe, otherwise (incl. NaN) critical
+        return self.STRESS_LEVELS[np.digitize(index, self.STRESS_BOUNDS)]
     
     def get_farm_recommendations(self, ccsi: float, wsi: float, hsi: float, 
                                  vhi: float, row: pd.Series) -> List[str]:
@@ -424,124 +452,234 @@ class MCSICalculator:
         
         return recommendations
     
-    def calculate_week_mcsi(self, fips: str, week_start: str, 
+    def calculate_week_mcsi(self, fips: str, week_start: Union[str, pd.Timestamp], 
                            week_end: Optional[str] = None) -> MCSIResponse:
         """
         Calculate MCSI for a specific county and week
         
         Args:
             fips: 5-digit county FIPS code
-            week_start: Start date (YYYY-MM-DD)
+            week_start: Start date (YYYY-MM-DD or Timestamp)
             week_end: End date (optional, defaults to 6 days after start)
         """
         try:
-            week_start_date = pd.to_datetime(week_start)
-            if week_end:
-                week_end_date = pd.to_datetime(week_end)
-            else:
-                week_end_date = week_start_date + timedelta(days=6)
+            week_start_date, week_end_date = self._week_bounds(week_start, week_end)
             
             # Get data for this week and county
-            mask = (self.data['fips'] == fips) & \
-                   (self.data['week_start'] >= week_start_date) & \
-                   (self.data['week_start'] <= week_end_date)
+            county_data = self.get_county_data(fips)
+            mask = (county_data['week_start'] >= week_start_date) & \
+                   (county_data['week_start'] <= week_end_date)
             
-            week_data = self.data[mask]
+            week_data = county_data[mask]
             
             if len(week_data) == 0:
-                raise ValueError(f"No data found for county {fips} in week {week_start}")
+                raise ValueError(f"No data found for county {fips} in week {week_start_date:%Y-%m-%d}")
             
             # Use the first record (should be representative for the week)
             row = week_data.iloc[0]
+            scores = self.calculate_stress_indices(week_data.iloc[:1]).iloc[0]
+            return self._build_mcsi(fips, row, scores, week_start_date, week_end_date)
+        
+        except Exception as e:
+            logger.error(f"Error calculating MCSI: {e}")
+            raise
+    
+    def calculate_week_mcsi_all(self, week_start: Union[str, pd.Timestamp],
+                                week_end: Optional[str] = None) -> Dict[str, MCSIResponse]:
+        """
+        Calculate MCSI for every county with data in a week
+        
+        Selects the week once and takes each county's first record, instead of
+        re-filtering the whole table once per county.
+        
+        Args:
+            week_start: Start date (YYYY-MM-DD or Timestamp)
+            week_end: End date (optional, defaults to 6 days after start)
+        
+        Returns: Dict mapping FIPS code to the county's MCSIResponse
+        """
+        try:
+            week_start_date, week_end_date = self._week_bounds(week_start, week_end)
+            first_rows, scores = self.calculate_week_scores(week_start_date, week_end_date)
             
-            # Calculate sub-indices
-            wsi, wsi_status, wsi_driver = self.calculate_water_stress_index(row)
-            hsi, hsi_status, hsi_driver = self.calculate_heat_stress_index(row)
-            vhi, vhi_status, vhi_driver = self.calculate_vegetation_health_index(row)
-            asi, asi_status, asi_driver = self.calculate_atmospheric_stress_index(row)
-            
-            # Calculate composite index
-            ccsi = self.calculate_composite_stress_index(wsi, hsi, vhi, asi)
-            ccsi_status = self._get_stress_status(ccsi)
-            
-            # Determine primary and secondary drivers
-            drivers = [
-                ("Water stress", wsi),
-                ("Heat stress", hsi),
-                ("Low vegetation health", vhi),
-                ("Atmospheric stress", asi),
-            ]
-            drivers.sort(key=lambda x: x[1], reverse=True)
-            primary_driver = drivers[0][0]
-            secondary_driver = drivers[1][0] if len(drivers) > 1 else "None"
-            
-            # Get raw indicators for transparency
-            indicators = {
-                'water_deficit_mean': float(row.get('water_deficit_mean', 0)),
-                'precipitation_mean': float(row.get('pr_mean', 0)),
-                'et_mean': float(row.get('et_ensemble_mad_mean', 0)),
-                'lst_mean': float(row.get('lst_day_1km_mean', 0)),
-                'vpd_mean': float(row.get('vpd_mean', 0)),
-                'eto_mean': float(row.get('eto_mean', 0)),
-                'ndvi_mean': float(row.get('ndvi_mean', 0)),
+            return {
+                row['fips']: self._build_mcsi(row['fips'], row, score, week_start_date, week_end_date)
+                for (_, row), (_, score) in zip(first_rows.iterrows(), scores.iterrows())
             }
-            
-            # Generate recommendations
-            recommendations = self.get_farm_recommendations(ccsi, wsi, hsi, vhi, row)
-            
-            # Build response
-            return MCSIResponse(
-                fips=fips,
-                county_name=row.get('county_name', 'Unknown'),
-                week_start=week_start_date.strftime('%Y-%m-%d'),
-                week_end=week_end_date.strftime('%Y-%m-%d'),
-                week_of_season=int(row.get('week_of_season', 0)),
-                
-                overall_stress_index=round(ccsi, 2),
-                overall_status=ccsi_status,
-                
-                water_stress_index=SubIndex(
-                    name="Water Stress Index",
-                    value=round(wsi, 2),
-                    status=wsi_status,
-                    key_driver=wsi_driver,
-                    description="Combination of water deficit, precipitation, and ET"
-                ),
-                heat_stress_index=SubIndex(
-                    name="Heat Stress Index",
-                    value=round(hsi, 2),
-                    status=hsi_status,
-                    key_driver=hsi_driver,
-                    description="Based on land surface temperature and atmospheric dryness"
-                ),
-                vegetation_health_index=SubIndex(
-                    name="Vegetation Health Index",
-                    value=round(vhi, 2),
-                    status=vhi_status,
-                    key_driver=vhi_driver,
-                    description="Normalized Difference Vegetation Index (NDVI)"
-                ),
-                atmospheric_stress_index=SubIndex(
-                    name="Atmospheric Stress Index",
-                    value=round(asi, 2),
-                    status=asi_status,
-                    key_driver=asi_driver,
-                    description="Evaporative demand and atmospheric conditions"
-                ),
-                
-                primary_driver=primary_driver,
-                secondary_driver=secondary_driver,
-                
-                historical_percentile=None,  # TODO: Calculate from climatology
-                anomaly=None,  # TODO: Calculate from climatology
-                
-                indicators=indicators,
-                farm_recommendations=recommendations,
-            )
         
         except Exception as e:
             logger.error(f"Error calculating MCSI: {e}")
             raise
+    
+    def calculate_week_scores(self, week_start: Union[str, pd.Timestamp],
+                              week_end: Optional[str] = None) -> tuple:
+        """
+        Score every county with data in a week, without building responses
+        
+        Args:
+            week_start: Start date (YYYY-MM-DD or Timestamp)
+            week_end: End date (optional, defaults to 6 days after start)
+        
+        Returns: (first_rows, scores) - each county's first record in the week and
+                 its calculate_stress_indices row, index-aligned
+        """
+        week_start_date, week_end_date = self._week_bounds(week_start, week_end)
+        
+        mask = (self.data['week_start'] >= week_start_date) & \
+               (self.data['week_start'] <= week_end_date)
+        first_rows = self.data[mask].drop_duplicates('fips')
+        
+        # Sub-indices for all counties in one vectorized pass
+        return first_rows, self.calculate_stress_indices(first_rows)
+    
+    def calculate_county_weeks_mcsi(self, fips: str, week_starts: pd.Series) -> List[MCSIResponse]:
+        """
+        Calculate MCSI for one county over several weeks
+        
+        Matches calculate_week_mcsi(fips, week_start) for each start date (each week
+        uses the county's first record in [start, start + 6 days]), but looks the
+        county up once and scores all weeks together. Weeks without data or whose
+        response cannot be built are logged and skipped.
+        
+        Args:
+            fips: 5-digit county FIPS code
+            week_starts: Week start dates (time of day is ignored)
+        
+        Returns: One MCSIResponse per week start that has data, in the given order
+        """
+        county_data = self.get_county_data(fips)
+        starts = pd.DatetimeIndex(week_starts.dt.normalize())
+        unique_starts = np.unique(starts.to_numpy())
+        
+        # A record belongs to every week starting 0-6 days before it: a contiguous run
+        # of the sorted starts, so expanding records to (week, record) pairs stays linear
+        record_dates = county_data['week_start'].to_numpy()
+        lo = np.searchsorted(unique_starts, record_dates - np.timedelta64(6, 'D'), side='left')
+        hi = np.searchsorted(unique_starts, record_dates, side='right')
+        counts = np.maximum(hi - lo, 0)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        week_idx = np.repeat(lo, counts) + offsets
+        record_pos = np.repeat(np.arange(len(record_dates)), counts)
+        
+        # Each week's first record in load order
+        first_pos = pd.Series(record_pos).groupby(week_idx).min()
+        rows = county_data.iloc[first_pos.to_numpy()]
+        scores = self.calculate_stress_indices(rows)
+        by_week = {
+            week: (row, score)
+            for week, (_, row), (_, score) in zip(first_pos.index, rows.iterrows(), scores.iterrows())
+        }
+        
+        results = []
+        for start, week in zip(starts, np.searchsorted(unique_starts, starts.to_numpy())):
+            try:
+                if week not in by_week:
+                    raise ValueError(f"No data found for county {fips} in week {start:%Y-%m-%d}")
+                row, score = by_week[week]
+                results.append(self._build_mcsi(fips, row, score, start, start + timedelta(days=6)))
+            except Exception as e:
+                logger.warning(f"Skipping {fips} on {start:%Y-%m-%d}: {e}")
+        
+        return results
+    
+    def get_county_data(self, fips: str) -> pd.DataFrame:
+        """All weekly records of a county, in load order (empty if the county is unknown)"""
+        return self.data.iloc[self._county_rows.get(fips, np.empty(0, dtype=np.intp))]
+    
+    def _week_bounds(self, week_start: Union[str, pd.Timestamp], week_end: Optional[str] = None) -> tuple:
+        """Parse week start/end dates (end defaults to 6 days after start); Timestamps pass through"""
+        week_start_date = pd.to_datetime(week_start)
+        if week_end:
+            week_end_date = pd.to_datetime(week_end)
+        else:
+            week_end_date = week_start_date + timedelta(days=6)
+        return week_start_date, week_end_date
+    
+    def _build_mcsi(self, fips: str, row: pd.Series, scores: pd.Series,
+                    week_start_date: pd.Timestamp, week_end_date: pd.Timestamp) -> MCSIResponse:
+        """Build the MCSI response for one county-week record and its row of calculate_stress_indices"""
+        # Sub-indices and composite index (plain floats, so round() matches scalar math)
+        wsi, hsi, vhi, asi, ccsi = (float(scores[k]) for k in ('wsi', 'hsi', 'vhi', 'asi', 'ccsi'))
+        wsi_status, wsi_driver = scores['wsi_status'], str(scores['wsi_driver'])
+        hsi_status, hsi_driver = scores['hsi_status'], str(scores['hsi_driver'])
+        vhi_status, vhi_driver = scores['vhi_status'], str(scores['vhi_driver'])
+        asi_status, asi_driver = scores['asi_status'], str(scores['asi_driver'])
+        ccsi_status = scores['ccsi_status']
+        
+        # Determine primary and secondary drivers
+        drivers = [
+            ("Water stress", wsi),
+            ("Heat stress", hsi),
+            ("Low vegetation health", vhi),
+            ("Atmospheric stress", asi),
+        ]
+        drivers.sort(key=lambda x: x[1], reverse=True)
+        primary_driver = drivers[0][0]
+        secondary_driver = drivers[1][0] if len(drivers) > 1 else "None"
+        
+        # Get raw indicators for transparency
+        indicators = {
+            'water_deficit_mean': float(row.get('water_deficit_mean', 0)),
+            'precipitation_mean': float(row.get('pr_mean', 0)),
+            'et_mean': float(row.get('et_ensemble_mad_mean', 0)),
+            'lst_mean': float(row.get('lst_day_1km_mean', 0)),
+            'vpd_mean': float(row.get('vpd_mean', 0)),
+            'eto_mean': float(row.get('eto_mean', 0)),
+            'ndvi_mean': float(row.get('ndvi_mean', 0)),
+        }
+        
+        # Generate recommendations
+        recommendations = self.get_farm_recommendations(ccsi, wsi, hsi, vhi, row)
+        
+        # Build response
+        return MCSIResponse(
+            fips=fips,
+            county_name=row.get('county_name', 'Unknown'),
+            week_start=week_start_date.strftime('%Y-%m-%d'),
+            week_end=week_end_date.strftime('%Y-%m-%d'),
+            week_of_season=int(row.get('week_of_season', 0)),
+            
+            overall_stress_index=round(ccsi, 2),
+            overall_status=ccsi_status,
+            
+            water_stress_index=SubIndex(
+                name="Water Stress Index",
+                value=round(wsi, 2),
+                status=wsi_status,
+                key_driver=wsi_driver,
+                description="Combination of water deficit, precipitation, and ET"
+            ),
+            heat_stress_index=SubIndex(
+                name="Heat Stress Index",
+                value=round(hsi, 2),
+                status=hsi_status,
+                key_driver=hsi_driver,
+                description="Based on land surface temperature and atmospheric dryness"
+            ),
+            vegetation_health_index=SubIndex(
+                name="Vegetation Health Index",
+                value=round(vhi, 2),
+                status=vhi_status,
+                key_driver=vhi_driver,
+                description="Normalized Difference Vegetation Index (NDVI)"
+            ),
+            atmospheric_stress_index=SubIndex(
+                name="Atmospheric Stress Index",
+                value=round(asi, 2),
+                status=asi_status,
+                key_driver=asi_driver,
+                description="Evaporative demand and atmospheric conditions"
+            ),
+            
+            primary_driver=primary_driver,
+            secondary_driver=secondary_driver,
+            
+            historical_percentile=None,  # TODO: Calculate from climatology
+            anomaly=None,  # TODO: Calculate from climatology
+            
+            indicators=indicators,
+            farm_recommendations=recommendations,
+        )
 
 
 # ==================== API Endpoints ====================
@@ -566,14 +704,17 @@ async def get_latest_mcsi():
     """
     try:
         week_data, latest_date = calculator.get_latest_week()
+        # Pass the Timestamp itself rather than formatting it for the calculator to re-parse
+        week_start = (latest_date - timedelta(days=6)).normalize()
+        
+        # One pass over the week for all counties instead of one table scan per county
+        mcsi_by_fips = calculator.calculate_week_mcsi_all(week_start)
         
         results = []
-        for _, row in week_data.iterrows():
-            fips = row['fips']
-            week_start = (latest_date - timedelta(days=6)).strftime('%Y-%m-%d')
-            
-            mcsi = calculator.calculate_week_mcsi(fips, week_start)
-            results.append(mcsi)
+        for fips in week_data['fips']:
+            if fips not in mcsi_by_fips:
+                raise ValueError(f"No data found for county {fips} in week {week_start:%Y-%m-%d}")
+            results.append(mcsi_by_fips[fips])
         
         return results
     
@@ -600,7 +741,7 @@ async def get_county_mcsi(
     try:
         if not date:
             _, latest_date = calculator.get_latest_week()
-            date = (latest_date - timedelta(days=6)).strftime('%Y-%m-%d')
+            date = (latest_date - timedelta(days=6)).normalize()
         
         mcsi = calculator.calculate_week_mcsi(fips, date)
         return mcsi
@@ -627,7 +768,7 @@ async def get_county_timeseries(
     """
     try:
         if calculator.data is not None:
-            county_data = calculator.data[calculator.data['fips'] == fips]
+            county_data = calculator.get_county_data(fips)
         
         if start_date:
             start = pd.to_datetime(start_date)
@@ -639,16 +780,8 @@ async def get_county_timeseries(
         
         county_data = county_data.sort_values('week_start').tail(limit)
         
-        results = []
-        for _, row in county_data.iterrows():
-            date_str = row['week_start'].strftime('%Y-%m-%d')
-            try:
-                mcsi = calculator.calculate_week_mcsi(fips, date_str)
-                results.append(mcsi)
-            except Exception as e:
-                logger.warning(f"Skipping {fips} on {date_str}: {e}")
-        
-        return results
+        # Score the selected weeks together instead of re-looking up each one
+        return calculator.calculate_county_weeks_mcsi(fips, county_data['week_start'])
     
     except Exception as e:
         logger.error(f"Error getting timeseries for {fips}: {e}")
@@ -665,51 +798,43 @@ async def get_mcsi_summary(
     Returns stress distribution, top stressed counties, etc.
     """
     try:
+        week_data, latest_date = calculator.get_latest_week()
         if not date:
-            _, latest_date = calculator.get_latest_week()
             date = (latest_date - timedelta(days=6)).strftime('%Y-%m-%d')
         
-        week_data, _ = calculator.get_latest_week()
-        
-        mcsi_values = []
-        for _, row in week_data.iterrows():
-            try:
-                mcsi = calculator.calculate_week_mcsi(row['fips'], date)
-                mcsi_values.append(mcsi)
-            except:
-                pass
-        
-        if not mcsi_values:
+        # Only the composite index is summarized: keep the week's scores as columns
+        # instead of building a full MCSIResponse (sub-indices, recommendations) per county
+        first_rows, scores = calculator.calculate_week_scores(date)
+        counties = pd.DataFrame({
+            'fips': first_rows['fips'].astype(str).to_numpy(),
+            'county_name': first_rows['county_name'].to_numpy(),
+            'stress_index': [round(v, 2) for v in scores['ccsi'].tolist()],
+            'status': scores['ccsi_status'].to_numpy(),
+        }).set_index('fips')
+        
+        # Counties without data for the requested week are left out
+        latest_fips = week_data['fips'].astype(str)
+        counties = counties.loc[latest_fips[latest_fips.isin(counties.index)]].reset_index()
+        
+        if counties.empty:
             raise ValueError("No data for requested week")
         
         # Calculate statistics
-        stress_indices = [m.overall_stress_index for m in mcsi_values]
+        stress_indices = counties['stress_index'].to_numpy()
+        
+        # Stable sorts keep ties in county order, like sorted()
+        most_stressed = np.argsort(-stress_indices, kind='stable')[:5]
+        least_stressed = np.argsort(stress_indices, kind='stable')[:5]
         
         return {
             "week_date": date,
-            "counties_analyzed": len(mcsi_values),
+            "counties_analyzed": len(counties),
             "average_stress_index": round(np.mean(stress_indices), 2),
             "max_stress_index": round(np.max(stress_indices), 2),
             "min_stress_index": round(np.min(stress_indices), 2),
             "std_stress_index": round(np.std(stress_indices), 2),
-            "critical_counties": [
-                {
-                    "fips": m.fips,
-                    "county_name": m.county_name,
-                    "stress_index": m.overall_stress_index,
-                    "status": m.overall_status
-                }
-                for m in sorted(mcsi_values, key=lambda x: x.overall_stress_index, reverse=True)[:5]
-            ],
-            "healthy_counties": [
-                {
-                    "fips": m.fips,
-                    "county_name": m.county_name,
-                    "stress_index": m.overall_stress_index,
-                    "status": m.overall_status
-                }
-                for m in sorted(mcsi_values, key=lambda x: x.overall_stress_index)[:5]
-            ]
+            "critical_counties": counties.iloc[most_stressed].to_dict('records'),
+            "healthy_counties": counties.iloc[least_stressed].to_dict('records'),
         }
     
     except Exception as e:
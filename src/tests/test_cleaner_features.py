@@ -0,0 +1,128 @@
+"""
+Equivalence tests for the shared daily/weekly feature builders
+
+Compares processing/cleaner/features.py against the original merge-based
+DataCleaner implementation on a small synthetic raw data set.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Loaded by path: the processing package __init__ pulls in the GCS client
+FEATURES_PATH = Path(__file__).parent.parent / 'data_service' / 'processing' / 'cleaner' / 'features.py'
+_spec = importlib.util.spec_from_file_location('cleaner_features', FEATURES_PATH)
+features = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(features)
+
+COUNTIES = ['19001', '19003', '19005']
+
+
+def reference_daily(raw):
+    """Original DataCleaner.create_daily_clean_data grid + chained merges"""
+    dates = []
+    for year in range(2016, 2026):
+        dates.extend(pd.date_range(f'{year}-05-01', f'{year}-10-31', freq='D'))
+    dates = pd.DatetimeIndex(dates)
+    counties = sorted(raw['ndvi']['fips'].unique())
+
+    grid = pd.MultiIndex.from_product([dates, counties], names=['date', 'fips'])
+    df = pd.DataFrame(index=grid).reset_index()
+    df['date'] = pd.to_datetime(df['date'])
+
+    county_map = raw['ndvi'][['fips', 'county_name']].drop_duplicates().set_index('fips')['county_name'].to_dict()
+    df['county_name'] = df['fips'].map(county_map)
+    df['year'] = df['date'].dt.year
+    df['month'] = df['date'].dt.month
+    df['doy'] = df['date'].dt.dayofyear
+    season_start = pd.to_datetime(df['year'].astype(str) + '-05-01')
+    df['week_of_season'] = ((df['date'] - season_start).dt.days // 7) + 1
+
+    for prefix in ['ndvi', 'lst', 'vpd', 'eto', 'pr']:
+        clean = raw[prefix][['date', 'fips', 'mean', 'std']].rename(
+            columns={'mean': f'{prefix}_mean', 'std': f'{prefix}_std'}
+        )
+        clean['date'] = pd.to_datetime(clean['date'])
+        df = df.merge(clean, on=['date', 'fips'], how='left')
+
+    wd_clean = raw['water_deficit'][['date', 'fips', 'water_deficit']].rename(
+        columns={'water_deficit': 'water_deficit_mean'}
+    )
+    wd_clean['water_deficit_std'] = 0
+    wd_clean['date'] = pd.to_datetime(wd_clean['date'])
+    df = df.merge(wd_clean, on=['date', 'fips'], how='left')
+
+    indicator_cols = [c for c in df.columns if c.endswith('_mean') or c.endswith('_std')]
+    for col in indicator_cols:
+        df[col] = df[col].fillna(0)
+    return df
+
+
+def reference_weekly(daily_df):
+    """Original DataCleaner.create_weekly_clean_data groupby with a per-group RMS lambda"""
+    grouped = daily_df.groupby(['year', 'week_of_season', 'fips', 'county_name'], observed=True)
+
+    agg_dict = {}
+    for col in daily_df.columns:
+        if col.endswith('_mean'):
+            agg_dict[col] = 'mean'
+        elif col.endswith('_std'):
+            agg_dict[col] = lambda x: np.sqrt(np.mean(x**2))
+
+    weekly_df = grouped[list(agg_dict.keys())].agg(agg_dict).reset_index()
+    weekly_df['date'] = weekly_df.apply(
+        lambda row: pd.Timestamp(int(row['year']), 5, 1) + pd.Timedelta(days=7 * (int(row['week_of_season']) - 1)),
+        axis=1
+    )
+    return weekly_df[['date', 'year', 'week_of_season', 'fips', 'county_name'] +
+                     [c for c in weekly_df.columns if c.endswith('_mean') or c.endswith('_std')]]
+
+
+@pytest.fixture
+def raw_indicators():
+    """Raw indicator frames as read_raw_indicators returns them: ISO text dates, float32
+    values, and 20% of county-days missing from each indicator"""
+    rng = np.random.default_rng(7)
+    dates = pd.date_range('2016-05-01', '2025-10-31', freq='D')
+    dates = dates[(dates.month >= 5) & (dates.month <= 10)]
+    grid = pd.MultiIndex.from_product([dates, COUNTIES], names=['date', 'fips']).to_frame(index=False)
+
+    raw = {}
+    for key in features.STAT_INDICATORS:
+        frame = grid.sample(frac=0.8, random_state=len(raw)).sort_values(['date', 'fips'])
+        frame['date'] = frame['date'].dt.strftime('%Y-%m-%d')
+        frame['mean'] = rng.random(len(frame)).astype('float32')
+        frame['std'] = rng.random(len(frame)).astype('float32')
+        raw[key] = frame.reset_index(drop=True)
+    raw['ndvi']['county_name'] = raw['ndvi']['fips'].map({fips: f'County {fips}' for fips in COUNTIES})
+
+    wd = raw['eto'][['date', 'fips']].copy()
+    wd['water_deficit'] = rng.normal(size=len(wd)).astype('float32')
+    raw['water_deficit'] = wd
+    return raw
+
+
+class TestFeatureEquivalence:
+    """features.py must reproduce the original daily/weekly tables"""
+
+    def test_build_daily_frame_matches_reference(self, raw_indicators):
+        """Flat grid + single join gives the same rows, columns and values as the merges"""
+        expected = reference_daily(raw_indicators)
+        result = features.build_daily_frame(raw_indicators)
+
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False,
+                                      check_categorical=False, atol=1e-6)
+
+    def test_aggregate_weekly_matches_reference(self, raw_indicators):
+        """Squared-mean RMS and broadcast week dates match the per-group lambdas"""
+        daily_df = features.build_daily_frame(raw_indicators)
+        expected = reference_weekly(daily_df)
+        result = features.aggregate_weekly(daily_df)
+
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True),
+                                      check_dtype=False, check_categorical=False, atol=1e-5)
@@ -0,0 +1,185 @@
+"""
+Equivalence tests for MCSICalculator.calculate_week_scores
+
+Compares the one-pass week scoring against the original per-county,
+per-row index calculation on a synthetic weekly table.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("fastapi")
+ds = pytest.importorskip("pyarrow.dataset")
+
+MCSI_SERVICE_PATH = Path(__file__).parent.parent / 'ml-models' / 'mcsi' / 'mcsi_service.py'
+WEEK_START = '2024-06-05'
+
+
+def reference_status(index):
+    """Original _get_stress_status"""
+    for bound, level in zip([20, 40, 60, 80], ['healthy', 'mild', 'moderate', 'severe']):
+        if index < bound:
+            return level
+    return 'critical'
+
+
+def reference_weighted(components):
+    """Weighted average over the (stress, weight) components that are present"""
+    present = [(stress, weight) for stress, weight in components if stress is not None]
+    if not present:
+        return 0
+    total_weight = sum(weight for _, weight in present)
+    return sum(stress * weight / total_weight for stress, weight in present)
+
+
+def reference_scores(row):
+    """Original calculate_*_stress_index methods, one county row at a time"""
+    def value(col):
+        return row[col] if col in row and pd.notna(row[col]) else None
+
+    def clip(x):
+        return None if x is None else min(100, max(0, x))
+
+    deficit, pr_sum, eto_sum = value('water_deficit_mean'), value('pr_sum'), value('eto_sum')
+    deficit_stress = clip(None if deficit is None else deficit / 6.0 * 100)
+    precip_stress = clip(None if pr_sum is None else (1 - pr_sum / 7.0 / 4.0) * 100)
+    et_stress = clip(None if eto_sum is None else eto_sum / 7.0 / 8.0 * 100)
+    wsi = reference_weighted([(deficit_stress, 0.40), (precip_stress, 0.35), (et_stress, 0.25)])
+    if deficit_stress is not None and deficit_stress > 60:
+        wsi_driver = "High water deficit"
+    elif precip_stress is not None and precip_stress > 60:
+        wsi_driver = "Low precipitation"
+    else:
+        wsi_driver = "Moderate water stress across indicators"
+
+    lst, vpd = value('lst_day_1km_mean'), value('vpd_mean')
+    lst_stress = None
+    if lst is not None:
+        if lst < 25:
+            lst_stress = (25 - lst) * 2
+        elif lst <= 32:
+            lst_stress = 0
+        elif lst <= 38:
+            lst_stress = (lst - 32) * 15
+        else:
+            lst_stress = min(100, 90 + (lst - 38) * 5)
+        lst_stress = min(100, lst_stress)
+    vpd_stress = clip(None if vpd is None else vpd / 3.0 * 100)
+    hsi = reference_weighted([(lst_stress, 0.60), (vpd_stress, 0.40)])
+    if lst_stress is not None and lst_stress > 50:
+        hsi_driver = f"High temperature ({lst:.1f}°C)"
+    elif vpd_stress is not None and vpd_stress > 50:
+        hsi_driver = "High atmospheric dryness"
+    else:
+        hsi_driver = "Moderate heat stress"
+
+    ndvi = value('ndvi_mean')
+    if ndvi is None:
+        vhi, vhi_driver = 0, "No NDVI data"
+    else:
+        if ndvi < 0.3:
+            vhi = 100
+        elif ndvi < 0.5:
+            vhi = 70 - (ndvi - 0.3) / 0.2 * 25
+        elif ndvi < 0.7:
+            vhi = 30 - (ndvi - 0.5) / 0.2 * 20
+        else:
+            vhi = max(0, 10 - (ndvi - 0.7) / 0.23 * 10)
+        vhi = clip(vhi)
+        vhi_driver = f"NDVI {ndvi:.3f} (vegetation vigor)"
+
+    eto = value('eto_mean')
+    eto_stress = clip(None if eto is None else eto / 10.0 * 100)
+    asi = reference_weighted([(vpd_stress, 0.50), (eto_stress, 0.50)])
+
+    ccsi = clip(wsi * 0.40 + hsi * 0.30 + vhi * 0.20 + asi * 0.10)
+    return {
+        'wsi': wsi, 'wsi_status': reference_status(wsi), 'wsi_driver': wsi_driver,
+        'hsi': hsi, 'hsi_status': reference_status(hsi), 'hsi_driver': hsi_driver,
+        'vhi': vhi, 'vhi_status': reference_status(vhi), 'vhi_driver': vhi_driver,
+        'asi': asi, 'asi_status': reference_status(asi), 'asi_driver': "Atmospheric evaporative demand",
+        'ccsi': ccsi, 'ccsi_status': reference_status(ccsi),
+    }
+
+
+def make_weekly():
+    """Weekly table with NaN indicators, piecewise boundaries, duplicate and mid-week records"""
+    rng = np.random.default_rng(11)
+    fips = [f'19{i:03d}' for i in range(1, 30, 2)]
+    weeks = pd.date_range('2024-05-01', periods=10, freq='7D')
+    df = pd.DataFrame([(f, f'County {f}', w, i + 1) for i, w in enumerate(weeks) for f in fips],
+                      columns=['fips', 'county_name', 'week_start', 'week_of_season'])
+    n = len(df)
+    df['water_deficit_mean'] = rng.uniform(-3, 9, n)
+    df['pr_sum'] = rng.uniform(0, 40, n)
+    df['eto_sum'] = rng.uniform(0, 70, n)
+    df['lst_day_1km_mean'] = rng.uniform(15, 45, n)
+    df['vpd_mean'] = rng.uniform(0, 4, n)
+    df['ndvi_mean'] = rng.uniform(0.1, 0.95, n)
+    df['eto_mean'] = rng.uniform(0, 12, n)
+    df['pr_mean'] = rng.uniform(0, 6, n)
+    df.loc[::5, 'lst_day_1km_mean'] = rng.choice([25, 32, 38, 50], len(df.loc[::5]))
+    df.loc[::7, 'ndvi_mean'] = rng.choice([0.3, 0.5, 0.7, 1.0], len(df.loc[::7]))
+    for col in ['water_deficit_mean', 'pr_sum', 'eto_sum', 'lst_day_1km_mean', 'vpd_mean', 'ndvi_mean', 'eto_mean']:
+        df.loc[rng.random(n) < 0.1, col] = np.nan
+
+    # A second record for some county-weeks, and one mid-week record
+    duplicates = df.sample(20, random_state=1).assign(water_deficit_mean=lambda d: d['water_deficit_mean'] + 3)
+    mid_week = df[df['week_start'] == WEEK_START].iloc[[2]].assign(
+        week_start=pd.Timestamp(WEEK_START) + pd.Timedelta(days=3), pr_sum=0.0
+    )
+    return pd.concat([df, duplicates, mid_week]).sample(frac=1, random_state=2).reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def calculator(tmp_path_factory):
+    """MCSICalculator loaded from a local weekly parquet instead of GCS (no climatology)"""
+    weekly_path = tmp_path_factory.mktemp('mcsi') / 'weekly.parquet'
+    make_weekly().to_parquet(weekly_path, index=False)
+    open_dataset = ds.dataset
+
+    def read_climatology(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    # The module builds its calculator at import time
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ds, 'dataset', lambda path, *args, **kwargs: open_dataset(weekly_path, *args, **kwargs))
+        mp.setattr(pd, 'read_parquet', read_climatology)
+        spec = importlib.util.spec_from_file_location('mcsi_service', MCSI_SERVICE_PATH)
+        mcsi_service = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mcsi_service)
+    return mcsi_service.calculator
+
+
+class TestWeekScoresEquivalence:
+    """calculate_week_scores must score each county's first record as the per-county path did"""
+
+    def test_selects_each_county_first_record(self, calculator):
+        first_rows, scores = calculator.calculate_week_scores(WEEK_START)
+
+        week_start = pd.Timestamp(WEEK_START)
+        data = calculator.data
+        week_data = data[(data['week_start'] >= week_start) &
+                         (data['week_start'] <= week_start + pd.Timedelta(days=6))]
+        expected_fips = list(pd.unique(week_data['fips'].astype(str)))
+
+        assert list(first_rows['fips'].astype(str)) == expected_fips
+        assert scores.index.equals(first_rows.index)
+        for fips, (_, row) in zip(expected_fips, first_rows.iterrows()):
+            expected_row = week_data[week_data['fips'] == fips].iloc[0]
+            pd.testing.assert_series_equal(row, expected_row, check_names=False)
+
+    def test_scores_match_row_wise_indices(self, calculator):
+        first_rows, scores = calculator.calculate_week_scores(WEEK_START)
+
+        for (_, row), (_, score) in zip(first_rows.iterrows(), scores.iterrows()):
+            expected = reference_scores(row)
+            for key, value in expected.items():
+                if key.endswith(('_status', '_driver')):
+                    assert score[key] == value, (row['fips'], key)
+                else:
+                    assert score[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (row['fips'], key)
@@ -0,0 +1,125 @@
+"""
+Equivalence tests for the vectorized QualityChecker
+
+Compares the broadcast range check, IQR outlier scan and completeness report
+against the original per-column loops on a fixture frame.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'data_service'))
+
+from validation.quality_checker import QualityChecker
+
+
+def reference_value_ranges(df):
+    """Original check_value_ranges: one dropna + comparison per column"""
+    violations = {}
+    for col, (min_val, max_val) in QualityChecker.VALID_RANGES.items():
+        if col in df.columns:
+            valid_data = df[col].dropna()
+            out_of_range = ((valid_data < min_val) | (valid_data > max_val)).sum()
+            if out_of_range > 0:
+                violations[col] = {
+                    'count': out_of_range,
+                    'pct': (out_of_range / len(valid_data)) * 100,
+                    'min': valid_data.min(),
+                    'max': valid_data.max(),
+                }
+    return len(violations) == 0, violations
+
+
+def reference_outliers(df):
+    """Original detect_outliers: per-column quantiles over all numeric columns"""
+    outliers = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        data = df[col].dropna()
+        Q1 = data.quantile(0.25)
+        Q3 = data.quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        outlier_count = ((data < lower_bound) | (data > upper_bound)).sum()
+        if outlier_count > 0:
+            outliers[col] = {
+                'count': outlier_count,
+                'pct': (outlier_count / len(data)) * 100,
+                'bounds': (lower_bound, upper_bound),
+            }
+    return outliers
+
+
+def reference_completeness(df, min_completeness=0.95):
+    """Original check_completeness: full-frame isna mask, computed twice"""
+    total_cells = df.shape[0] * df.shape[1]
+    missing_cells = df.isna().sum().sum()
+    completeness = 1 - (missing_cells / total_cells)
+    report = {
+        'total_cells': total_cells,
+        'missing_cells': missing_cells,
+        'completeness': completeness,
+        'by_column': df.isna().sum().to_dict(),
+    }
+    return completeness >= min_completeness, report
+
+
+def assert_same(result, expected, path='result'):
+    """Recursive equality for nested report dicts/tuples (floats to rounding error)"""
+    if isinstance(expected, dict):
+        assert list(result) == list(expected), path
+        for key in expected:
+            assert_same(result[key], expected[key], f'{path}.{key}')
+    elif isinstance(expected, tuple):
+        assert len(result) == len(expected), path
+        for i, (r, e) in enumerate(zip(result, expected)):
+            assert_same(r, e, f'{path}[{i}]')
+    elif isinstance(expected, (float, np.floating)):
+        assert result == pytest.approx(expected, rel=1e-9, nan_ok=True), path
+    else:
+        assert result == expected, path
+
+
+@pytest.fixture
+def daily_frame():
+    """Daily indicator frame with missing values, out-of-range values and outliers"""
+    rng = np.random.default_rng(3)
+    n = 600
+    df = pd.DataFrame({
+        'date': np.repeat(pd.date_range('2024-05-01', periods=n // 3), 3),
+        'fips': np.tile(['19001', '19003', '19005'], n // 3),
+        'ndvi_mean': rng.uniform(0.1, 0.9, n),
+        'ndvi_std': rng.uniform(0, 0.2, n),
+        'lst_mean': rng.normal(28, 4, n).astype('float32'),
+        'vpd_mean': rng.uniform(0, 3, n),
+        'pr_mean': rng.exponential(3, n),
+        'water_deficit': rng.normal(0, 3, n),
+    })
+    df.loc[::4, 'ndvi_mean'] = np.nan
+    df.loc[::9, 'ndvi_mean'] = 5
+    df.loc[3, 'lst_mean'] = 70
+    df.loc[5, 'pr_mean'] = -1
+    df.loc[7, 'water_deficit'] = 40
+    return df
+
+
+class TestQualityCheckerEquivalence:
+    """Vectorized checks must report exactly what the per-column loops did"""
+
+    def test_check_value_ranges(self, daily_frame):
+        assert_same(QualityChecker().check_value_ranges(daily_frame), reference_value_ranges(daily_frame))
+
+    def test_check_value_ranges_all_missing_column(self, daily_frame):
+        daily_frame['ndvi_std'] = np.nan
+        daily_frame = daily_frame.drop(columns=['vpd_mean'])
+        assert_same(QualityChecker().check_value_ranges(daily_frame), reference_value_ranges(daily_frame))
+
+    def test_detect_outliers(self, daily_frame):
+        assert_same(QualityChecker().detect_outliers(daily_frame), reference_outliers(daily_frame))
+
+    def test_check_completeness(self, daily_frame):
+        assert_same(QualityChecker().check_completeness(daily_frame), reference_completeness(daily_frame))